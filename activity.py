@@ -0,0 +1,99 @@
+# Imports
+import calendar
+import os
+
+import numpy as np
+import plotly.graph_objects as go
+
+from transactions import AMOUNT_SCALE
+
+WEEKDAYS = list(calendar.day_name)
+
+# Time-of-day bin width; 30 gives the 7 x 48 grid matching hourly_data and
+# finer widths refine it. It must divide the day, or the last slot of a day
+# would spill into the next weekday's bins.
+SLOT_MINUTES = int(os.environ.get('ACTIVITY_SLOT_MINUTES', 30))
+
+NS_PER_MINUTE = 60 * 10**9
+NS_PER_DAY = 24 * 60 * NS_PER_MINUTE
+NAT = np.iinfo(np.int64).min
+
+
+def slot_labels(slot_minutes=SLOT_MINUTES):
+    minutes = np.arange(0, 24 * 60, slot_minutes)
+    return [f"{(m // 60) % 12 or 12}:{m % 60:02d}:00 {'AM' if m < 12 * 60 else 'PM'}" for m in minutes]
+
+
+# Activity grids
+# One 2-D binning over the timestamps of the compact table for every client at
+# once: each row gets a flat (client, weekday, slot) bin and three bincounts
+# give count, volume and successes. Timestamps are local wall-clock time, as
+# in the hourly slices. The portfolio grid is the sum over clients.
+def activity_grids(table, slot_minutes=SLOT_MINUTES):
+    if not 0 < slot_minutes <= 30 or (24 * 60) % slot_minutes:
+        raise ValueError(
+            f"ACTIVITY_SLOT_MINUTES must be at most 30 and divide the 1440 minutes of a day, got {slot_minutes}"
+        )
+    columns = table['columns']
+    timestamps = columns['Timestamp']
+    valid = timestamps != NAT
+    timestamps = timestamps[valid]
+    clients = columns['Client'][valid].astype(np.int64)
+    n_clients = len(table['lookups']['Client'])
+    # Rows without a client still count towards the portfolio
+    clients = np.where(clients < 0, n_clients, clients)
+
+    days, time_of_day = np.divmod(timestamps, NS_PER_DAY)
+    weekdays = (days + 3) % 7  # 1970-01-01 was a Thursday
+    slots = time_of_day // (slot_minutes * NS_PER_MINUTE)
+    n_slots = 24 * 60 // slot_minutes
+
+    bins = (clients * 7 + weekdays) * n_slots + slots
+    size = (n_clients + 1) * 7 * n_slots
+    shape = (n_clients + 1, 7, n_slots)
+    success_code = list(table['lookups']['Status']).index('Success')
+    count = np.bincount(bins, minlength=size).reshape(shape)
+    volume = np.bincount(bins, weights=columns['Amount'][valid], minlength=size).reshape(shape) / AMOUNT_SCALE
+    successes = np.bincount(
+        bins, weights=columns['Status'][valid] == success_code, minlength=size
+    ).reshape(shape)
+
+    def grid(count, volume, successes):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            success_rate = np.where(count > 0, successes / count * 100, np.nan)
+        return {'Count': count, 'Volume': volume, 'Success_Rate': success_rate}
+
+    grids = {'Portfolio': grid(count.sum(axis=0), volume.sum(axis=0), successes.sum(axis=0))}
+    for code, client in enumerate(table['lookups']['Client']):
+        if count[code].any():
+            grids[client] = grid(count[code], volume[code], successes[code])
+    return grids
+
+
+# Heatmap of volume (KES millions) with count and success rate on hover. The
+# clientside Volume/Count, unit and success-rate toggles swap z in the
+# browser.
+def activity_heatmap(grid):
+    labels = slot_labels(24 * 60 // grid['Count'].shape[1])
+    return go.Figure(
+        go.Heatmap(
+            z=grid['Volume']/1e6,
+            x=labels,
+            y=WEEKDAYS,
+            customdata=np.dstack([grid['Count'], grid['Success_Rate']]),
+            colorscale='Blues',
+            colorbar=dict(title='KES Millions'),
+            hovertemplate=(
+                "<b>%{y} %{x}</b><br>" +
+                "Value: %{z:,.2f}<br>" +
+                "Transactions: %{customdata[0]:,}<br>" +
+                "Success Rate: %{customdata[1]:.1f}%<extra></extra>"
+            )
+        )
+    ).update_layout(
+        title='Weekly Activity by Time of Day',
+        xaxis=dict(title='Time of Day', tickangle=-45),
+        yaxis=dict(autorange='reversed'),
+        height=400,
+        margin=dict(l=50, r=50, t=50, b=100)
+    )
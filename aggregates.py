@@ -0,0 +1,214 @@
+# Imports
+import numpy as np
+import pandas as pd
+
+from data import (
+    client_data, monthly_data, daily_data, hourly_data, country_data,
+    recipients_data, load_transactions
+)
+from instrumentation import timed_query
+from transactions import AMOUNT_SCALE, encode_transactions
+from cohorts import cohort_matrix
+from corridors import corridor_aggregate, sankey_links
+from forecasting import build_forecasts
+from activity import NAT, NS_PER_DAY, NS_PER_MINUTE, WEEKDAYS, activity_grids, slot_labels
+from validation import (
+    enforce, is_strict, reconcile_aggregates, reconcile_client_slices, reconcile_summary_tables
+)
+
+# Slice definitions: slice name -> (dimension column, portfolio table, volume column, count column)
+SLICES = {
+    'monthly': ('Month', monthly_data, 'Volume', 'Count'),
+    'daily': ('Day', daily_data, 'Volume', 'Count'),
+    'hourly': ('Hour', hourly_data, 'Volume', 'Count'),
+    'country': ('Country', country_data, 'Volume_KES', 'Transactions'),
+    'bank': ('Bank', recipients_data, 'Volume', 'Transactions'),
+}
+
+# Time dimensions keep calendar order; the others are ranked by volume
+ORDERED_SLICES = ('monthly', 'daily', 'hourly')
+
+# Half-hour slots, as in hourly_data
+HOUR_SLOT_MINUTES = 30
+
+# The hand-typed summary tables cover calendar 2024
+SUMMARY_PERIODS = np.arange('2024-01', '2025-01', dtype='datetime64[M]')
+
+
+# Monthly slices carry the first day of each month next to its label, so
+# forecasts can step to the following month
+def _monthly_index(periods):
+    return pd.DataFrame({
+        'Month': pd.to_datetime(periods).strftime('%B %Y'),
+        'Period': periods.astype('datetime64[ns]')
+    })
+
+
+# Integer slice keys from the compact table: per slice the bin code of every
+# row, the rows it covers and the labels of its bins. Timestamps are local
+# wall-clock nanoseconds, so months, weekdays and half-hour slots are plain
+# integer arithmetic and only the small aggregate is ever formatted. Months
+# run over the full year-month range so years never merge; rows with no
+# timestamp are left out of the time slices, a missing country is reported as
+# 'Unknown' and the bank slice covers bank payouts only, as in recipients_data.
+def _slice_keys(table):
+    columns, lookups = table['columns'], table['lookups']
+    timestamps = columns['Timestamp']
+    timed = timestamps != NAT
+    days, time_of_day = np.divmod(timestamps, NS_PER_DAY)
+    months = timestamps.view('datetime64[ns]').astype('datetime64[M]').view(np.int64)
+    first, last = (months[timed].min(), months[timed].max()) if timed.any() else (0, -1)
+    periods = np.arange(first, last + 1).astype('datetime64[M]')
+    countries = columns['Country'].astype(np.int64)
+    return {
+        'monthly': (months - first, _monthly_index(periods), timed),
+        'daily': ((days + 3) % 7, pd.DataFrame({'Day': WEEKDAYS}), timed),  # 1970-01-01 was a Thursday
+        'hourly': (
+            time_of_day // (HOUR_SLOT_MINUTES * NS_PER_MINUTE),
+            pd.DataFrame({'Hour': slot_labels(HOUR_SLOT_MINUTES)}),
+            timed
+        ),
+        'country': (
+            np.where(countries < 0, len(lookups['Country']), countries),
+            pd.DataFrame({'Country': [*lookups['Country'], 'Unknown']}),
+            np.ones(len(countries), dtype=bool)
+        ),
+        'bank': (columns['Bank'], pd.DataFrame({'Bank': lookups['Bank']}), columns['Bank'] >= 0),
+    }
+
+
+def _slice_frame(name, index, count, volume, successes):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        success_rate = np.where(count > 0, successes / count * 100, np.nan)
+    frame = index.assign(Volume=volume, Count=count, Success_Rate=success_rate)
+    if name in ORDERED_SLICES:
+        return frame
+    return frame[count > 0].sort_values('Volume', ascending=False).reset_index(drop=True)
+
+
+# Per-client and portfolio slices from the compact table: each row gets a
+# flat (client, bin) index and three bincounts per slice give count, volume
+# and successes for every client at once; the portfolio is the sum over
+# clients. Returns (portfolio, {client: slices}).
+def client_slices(table):
+    columns, lookups = table['columns'], table['lookups']
+    n_clients = len(lookups['Client'])
+    # Rows without a client have no page; they sit in a trailing bucket
+    clients = columns['Client'].astype(np.int64)
+    clients = np.where(clients < 0, n_clients, clients)
+    present = np.bincount(clients, minlength=n_clients + 1)[:n_clients] > 0
+    success = columns['Status'] == list(lookups['Status']).index('Success')
+    portfolio = {}
+    slices = {client: {} for client in lookups['Client'][present]}
+    for name, (codes, index, rows) in _slice_keys(table).items():
+        shape = (n_clients + 1, len(index))
+        bins = clients[rows] * shape[1] + codes[rows]
+        count = np.bincount(bins, minlength=shape[0] * shape[1]).reshape(shape)
+        volume = np.bincount(
+            bins, weights=columns['Amount'][rows], minlength=shape[0] * shape[1]
+        ).reshape(shape) / AMOUNT_SCALE
+        successes = np.bincount(bins, weights=success[rows], minlength=shape[0] * shape[1]).reshape(shape)
+        portfolio[name] = _slice_frame(name, index, count.sum(axis=0), volume.sum(axis=0), successes.sum(axis=0))
+        for code in np.flatnonzero(present):
+            slices[lookups['Client'][code]][name] = _slice_frame(
+                name, index, count[code], volume[code], successes[code]
+            )
+    return portfolio, slices
+
+
+# Split each integer total over the profile by largest remainder, so every
+# row of the result sums exactly to its total
+def _apportion(totals, profile):
+    exact = np.outer(totals, profile)
+    counts = np.floor(exact).astype(int)
+    short = totals - counts.sum(axis=1)
+    rank = np.argsort(np.argsort(counts - exact, axis=1), axis=1)
+    return counts + (rank < short[:, None])
+
+
+# Per-client slices estimated from the portfolio tables: each client's
+# client_data volume and transaction totals are spread over the shape of
+# every portfolio table, so a client page adds up to that client's row. The
+# tables carry no per-client success rates, so none are estimated.
+def estimated_client_slices():
+    clients = client_data['Client']
+    totals = client_data['Volume'].to_numpy(dtype=float)
+    transactions = client_data['Transactions'].to_numpy()
+    slices = {client: {} for client in clients}
+    for name, (key, table, volume, count) in SLICES.items():
+        # Every client shares the table's shape, so one ordering serves all
+        profile = table[volume].to_numpy()
+        order = slice(None) if name in ORDERED_SLICES else np.argsort(-profile, kind='stable')
+        volumes = np.outer(totals, profile / profile.sum())[:, order]
+        counts = _apportion(transactions, table[count].to_numpy() / table[count].sum())[:, order]
+        labels = table[key].to_numpy()[order]
+        for i, client in enumerate(clients):
+            frame = pd.DataFrame({key: labels, 'Volume': volumes[i], 'Count': counts[i]})
+            if name == 'monthly':
+                frame['Period'] = SUMMARY_PERIODS.astype('datetime64[ns]')
+            slices[client][name] = frame
+    return slices
+
+
+# Portfolio series from the summary tables, for the estimated refresh
+PORTFOLIO = {
+    'monthly': monthly_data.assign(Period=SUMMARY_PERIODS.astype('datetime64[ns]')),
+    'daily': daily_data,
+    'hourly': hourly_data
+}
+
+
+def forecasts(portfolio, clients, observed_through=None):
+    with timed_query('build_forecasts'):
+        return build_forecasts({'Portfolio': portfolio, **clients}, observed_through)
+
+
+# Date of the last timestamped transaction in the compact table
+def _observed_through(table):
+    timestamps = table['columns']['Timestamp']
+    timestamps = timestamps[timestamps != NAT]
+    return timestamps.max().astype('datetime64[ns]').astype('datetime64[D]') if len(timestamps) else None
+
+
+# Refresh: build every precomputed aggregate the dashboard serves. The raw
+# frame is encoded once and every aggregate reads the compact table; neither
+# outlives the refresh, only the small aggregates are kept.
+# Reconciliation runs before anything is returned, so a strict failure raises
+# ReconciliationError instead of publishing inconsistent numbers.
+def refresh(transactions=None):
+    with timed_query('reconcile_summary_tables'):
+        summary_report = enforce(reconcile_summary_tables(), is_strict(False))
+    if transactions is None:
+        with timed_query('load_transactions'):
+            transactions = load_transactions()
+    if transactions is None:
+        with timed_query('estimated_client_slices'):
+            clients = estimated_client_slices()
+        return {
+            'source': 'estimated', 'portfolio': PORTFOLIO, 'clients': clients,
+            'forecasts': forecasts(PORTFOLIO, clients), 'cohorts': None, 'corridors': None,
+            'activity': None, 'reconciliation': summary_report
+        }
+    with timed_query('encode_transactions'):
+        table = encode_transactions(transactions)
+    with timed_query('client_slices'):
+        portfolio, clients = client_slices(table)
+    with timed_query('reconcile_client_slices'):
+        slices_report = enforce(reconcile_client_slices(clients, table), is_strict(True))
+    with timed_query('cohort_matrix'):
+        cohorts = cohort_matrix(table)
+    with timed_query('corridor_aggregate'):
+        corridors = sankey_links(corridor_aggregate(table))
+    with timed_query('activity_grids'):
+        activity = activity_grids(table)
+    with timed_query('reconcile_aggregates'):
+        aggregates_report = enforce(
+            reconcile_aggregates(portfolio, clients, corridors, activity, table), is_strict(True)
+        )
+    return {
+        'source': 'transactions', 'portfolio': portfolio, 'clients': clients,
+        'forecasts': forecasts(portfolio, clients, _observed_through(table)), 'cohorts': cohorts, 'corridors': corridors,
+        'activity': activity, 'reconciliation': pd.concat(
+            [summary_report, slices_report, aggregates_report], ignore_index=True
+        )
+    }
@@ -1,51 +1,25 @@
 # Imports
-import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import ClientsideFunction, Input, Output, State, ALL
 import dash_bootstrap_components as dbc
-import numpy as np
 import os
+from urllib.parse import unquote
 
-# App initialization
-app = dash.Dash(
-    __name__, 
-    external_stylesheets=[
-        dbc.themes.FLATLY,
-        'https://fonts.googleapis.com/css2?family=Bebas+Neue&display=swap'
-    ]
+from data import (
+    CLIENT_LOGOS, BANK_LOGOS, monthly_data, industry_data, daily_data,
+    hourly_data, failure_data, country_data, client_data, recipients_data
 )
-
-# Render deployment
-server = app.server
-
-# Logo mappings
-CLIENT_LOGOS = {
-    'Lemfi': 'LEMFI.png',
-    'DLocal': 'DLocal.png',
-    'Tangent': 'Tangent.jpg',
-    'Nala': 'Nala.png',
-    'Brij': 'brij.png',
-    'Cellulant': 'Cellulant.png',
-    'Wapipay':'wapipay.jpg',
-    'Others': 'Others.jpg'
-}
-
-BANK_LOGOS = {
-    'ABSA Bank': 'Absa.png',
-    'Cooperative Bank': 'Coop.jpg',
-    'DT Bank': 'DTB.png',
-    'Equity Bank': 'Equity.png',
-    'Family Bank': 'Familybank.jpeg',
-    'I&M Bank': 'im.png',
-    'KCB Bank': 'KCB.png',
-    'NCBA Bank': 'NCBA.png'
-}
+import aggregates
+from instrumentation import instrument, timed_callback
+from cohorts import cohort_heatmap
+from corridors import corridor_sankey
+from components import activity_graph, trend_controls, trend_graph
+from client_pages import client_href, client_layout, register_slices, CLIENT_SLICES
 
 # Custom CSS
-app.index_string = '''<!DOCTYPE html>
+INDEX_STRING = '''<!DOCTYPE html>
 <html>
     <head>
         {%metas%}
@@ -77,101 +51,31 @@ app.index_string = '''<!DOCTYPE html>
     </body>
 </html>'''
 
-# Monthly data
-monthly_data = pd.DataFrame({
-    'Month': ['January', 'February', 'March', 'April', 'May', 'June', 
-             'July', 'August', 'September', 'October', 'November', 'December'],
-    'Count': [4416, 3709, 4305, 4683, 3325, 2396, 31, 41, 1198, 2147, 3623, 8217],
-    'Volume': [296564946.80, 276359353.66, 278039056.61, 280441910.59, 223579836.58, 
-               143369486.87, 925.00, 3843.65, 22142455.28, 53713252.25, 74217693.61, 69555157.68],
-    'Success_Rate': [96.5, 96.1, 85.2, 91.7, 96.2, 92.0, 38.7, 97.6, 86.6, 97.0, 77.1, 80.1],
-    'Unique_Remitters': [2067, 1762, 1688, 2120, 1309, 1169, 3, 4, 529, 987, 1270, 1457],
-    'Unique_Recipients': [2241, 2080, 2136, 2381, 1865, 1539, 6, 14, 420, 740, 945, 1229]
-})
-
-# Industry data
-industry_data = pd.DataFrame({
-    'Industry': ['Other', 'Banking', 'Real Estate', 'Savings', 'Securities & Insurance',
-                'Retail & Grocery', 'Religious', 'Education', 'Hospitality', 'Medical',
-                'Energy & Heavy Industry', 'Government', 'Telco & Tech'],
-    'Volume': [1461861363.64, 134495270.02, 30405803.67, 44181713.27, 19007552.35,
-               10461967.57, 4470010.73, 4785022.56, 3771930.72, 1829661.46,
-               1812760.27, 515721.32, 389141.00]
-})
-
-# Daily transaction data
-daily_data = pd.DataFrame({
-    'Day': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'],
-    'Volume': [276574448.00, 279786235.00, 240526477.00, 328697945.00, 
-               397293759.00, 208898138.00, 169167368.00],
-    'Count': [5137, 4597, 4153, 5062, 6718, 4670, 3715]
-})
-
-# Hourly data
-hourly_data = pd.DataFrame({
-    'Hour': ['12:00:00 AM', '12:30:00 AM', '1:00:00 AM', '1:30:00 AM', '2:00:00 AM', '2:30:00 AM', 
-            '3:00:00 AM', '3:30:00 AM', '4:00:00 AM', '4:30:00 AM', '5:00:00 AM', '5:30:00 AM', 
-            '6:00:00 AM', '6:30:00 AM', '7:00:00 AM', '7:30:00 AM', '8:00:00 AM', '8:30:00 AM', 
-            '9:00:00 AM', '9:30:00 AM', '10:00:00 AM', '10:30:00 AM', '11:00:00 AM', '11:30:00 AM',
-            '12:00:00 PM', '12:30:00 PM', '1:00:00 PM', '1:30:00 PM', '2:00:00 PM', '2:30:00 PM',
-            '3:00:00 PM', '3:30:00 PM', '4:00:00 PM', '4:30:00 PM', '5:00:00 PM', '5:30:00 PM',
-            '6:00:00 PM', '6:30:00 PM', '7:00:00 PM', '7:30:00 PM', '8:00:00 PM', '8:30:00 PM',
-            '9:00:00 PM', '9:30:00 PM', '10:00:00 PM', '10:30:00 PM', '11:00:00 PM', '11:30:00 PM'],
-    'Volume': [23923595.64, 28073570.30, 20093102.50, 18651483.10, 20284409.18, 18327660.92,
-              21046999.52, 18624234.82, 17169134.74, 15938434.62, 16470431.39, 18256504.64,
-              14473250.50, 16664174.87, 21174240.02, 24384442.52, 28430233.46, 35683605.96,
-              32293483.80, 33624440.10, 35471112.12, 41021127.01, 42365401.43, 47930870.44,
-              38029682.04, 41993842.60, 43313929.16, 35436329.29, 34235004.81, 47425583.34,
-              39225509.52, 40058302.81, 34244174.47, 35949800.94, 31541304.54, 34645475.68,
-              42870360.52, 41022579.30, 40635039.28, 33436334.89, 42422933.78, 45150244.19,
-              35818593.44, 29583004.24, 33139351.87, 31088863.08, 29389421.09, 32641760.13],
-    'Count': [456, 443, 433, 365, 354, 325, 421, 277, 309, 327, 309, 285,
-              246, 287, 298, 356, 392, 495, 478, 480, 524, 598, 669, 897,
-              593, 651, 658, 630, 627, 695, 648, 654, 591, 602, 639, 602,
-              597, 642, 677, 588, 704, 711, 588, 494, 513, 463, 444, 503]
-})
-
-# Failure data
-failure_data = pd.DataFrame({
-    'Reason': ['Insufficient Balance', 'Other', 'System Error', 'Invalid Account', 
-               'Invalid Credit Party', 'Timed Out', 'General Failure', 'SOAP Error', 'Limit Exceeded'],
-    'Count': [2216, 592, 437, 251, 83, 133, 23, 6, 2],
-    'Percentage': [58.3, 15.6, 11.5, 6.6, 2.2, 3.5, 0.6, 0.2, 0.1]
-})
-
-# Country data
-country_data = pd.DataFrame({
-    'Country': ['United Kingdom (GBR)', 'United States (USA)', 'Canada (CAN)', 
-                'Kenya (KEN)', 'Nigeria (NGA)', 'Tanzania (TZA)', 'UAE',
-                'Denmark (DEN)', 'India (IND)'],
-    'Volume_KES': [961197746.35, 422501849.21, 68916278.01, 
-                   32036111.63, 6352832.02, 391069.01, 51955.00,
-                   159767.50, 45998.61],
-    'Transactions': [18050, 7906, 1842, 1339, 395, 6, 2, 4, 2]
-})
-
-# Client data
-client_data = pd.DataFrame({
-    'Client': ['Lemfi', 'DLocal', 'Tangent', 'Nala', 'Wapipay', 'Brij', 
-              'Cellulant', 'Others'],
-    'Volume': [1701947843.25, 410741870.10, 31148619.48, 13119614.16, 
-              15022090.45, 28085.00, 43.00, 0.00],
-    'Transactions': [29281, 4547, 203, 173, 42, 42, 4, 0],
-    'Market_Share': [78.36, 18.91, 1.43, 0.60, 0.69, 0.01, 0.00, 0.00]
-})
-
-# Bank recipients data
-recipients_data = pd.DataFrame({
-    'Bank': ['ABSA Bank', 'Cooperative Bank', 'DT Bank', 'Equity Bank', 
-            'Family Bank', 'I&M Bank', 'KCB Bank', 'NCBA Bank'],
-    'Volume': [7282025.65, 11802956.97, 7677251.81, 24819864.19,
-              9481656.86, 9501100.76, 17038871.74, 11536537.68],
-    'Transactions': [139, 338, 124, 889, 215, 244, 348, 195],
-    'Market_Share': [6.53, 10.58, 6.88, 22.25, 8.50, 8.52, 15.27, 10.34]
-})
+# Precomputed aggregates and per-client slices
+DASHBOARD = aggregates.refresh()
+register_slices(DASHBOARD['clients'], DASHBOARD['source'], DASHBOARD['forecasts'], DASHBOARD['activity'])
+
+# Portfolio trend series: the summary tables, or with TRANSACTIONS_PATH set the
+# portfolio slices built from the transactions, so the charts plot the same
+# series the forecasts are fitted on
+monthly_trend = DASHBOARD['portfolio']['monthly']
+daily_trend = DASHBOARD['portfolio']['daily']
+hourly_trend = DASHBOARD['portfolio']['hourly']
+
+
+# Payout bank shares derived from volume rather than the stored Market_Share,
+# which reconcile_summary_tables flags as inconsistent
+recipient_shares = recipients_data.set_index('Bank')['Volume'] / recipients_data['Volume'].sum() * 100
+
+
+# An export without timestamps leaves the series empty
+def peak(frame, key, column):
+    if frame.empty:
+        return 'n/a'
+    return frame.loc[frame[column].idxmax(), key]
 
 # Start App Layout
-app.layout = dbc.Container([
+main_layout = dbc.Container([
     # Header
     dbc.Row([
         dbc.Col([
@@ -280,25 +184,29 @@ app.layout = dbc.Container([
         ])
     ], className="mb-4"),
 
+    # Trend Display Options
+    trend_controls(),
+
     # Monthly Volume Trends
     dbc.Row([
         dbc.Col([
             dbc.Card([
                 dbc.CardHeader("Monthly Transaction Analysis"),
                 dbc.CardBody([
-                    dcc.Graph(
+                    trend_graph(
+                        'monthly', monthly_trend, forecast=DASHBOARD['forecasts'].get('Portfolio'),
                         figure=go.Figure(data=[
                             go.Bar(
                                 name='Volume',
-                                x=monthly_data['Month'],
-                                y=monthly_data['Volume']/1e6,
+                                x=monthly_trend['Month'],
+                                y=monthly_trend['Volume']/1e6,
                                 marker_color='rgba(26, 118, 255, 0.8)',
                                 yaxis='y'
                             ),
                             go.Scatter(
                                 name='Success Rate',
-                                x=monthly_data['Month'],
-                                y=monthly_data['Success_Rate'],
+                                x=monthly_trend['Month'],
+                                y=monthly_trend['Success_Rate'],
                                 mode='lines+markers',
                                 marker=dict(
                                     size=8,
@@ -337,9 +245,9 @@ app.layout = dbc.Container([
                     ),
                     html.Div([
                         html.P([
-                            "Peak Month: December ",
+                            f"Peak Month: {peak(monthly_trend, 'Month', 'Volume')} ",
                             html.Span(
-                                f"(KES {monthly_data['Volume'].max()/1e6:.1f}M, {monthly_data['Success_Rate'].max():.1f}% success rate)",
+                                f"(KES {monthly_trend['Volume'].max()/1e6:.1f}M, {monthly_trend['Success_Rate'].max():.1f}% success rate)",
                                 className="text-muted"
                             )
                         ], className="mb-0 mt-3 regular-text text-center")
@@ -360,7 +268,7 @@ app.layout = dbc.Container([
                         figure=go.Figure(
                             go.Indicator(
                                 mode="gauge+number",
-                                value=monthly_data['Success_Rate'].mean(),
+                                value=monthly_trend['Success_Rate'].mean(),
                                 title={"text": "Average Success Rate",
                                        "font": {"size": 16},
                                        "align": "center"},
@@ -377,7 +285,7 @@ app.layout = dbc.Container([
                                     'threshold': {
                                         'line': {'color': "red", 'width': 2},
                                         'thickness': 0.75,
-                                        'value': monthly_data['Success_Rate'].mean()
+                                        'value': monthly_trend['Success_Rate'].mean()
                                     }
                                 }
                             )
@@ -460,19 +368,20 @@ app.layout = dbc.Container([
             dbc.Card([
                 dbc.CardHeader("Daily Transaction Distribution"),
                 dbc.CardBody([
-                    dcc.Graph(
+                    trend_graph(
+                        'daily', daily_trend,
                         figure=go.Figure(data=[
                             go.Bar(
                                 name='Volume',
-                                x=daily_data['Day'],
-                                y=daily_data['Volume']/1e6,
+                                x=daily_trend['Day'],
+                                y=daily_trend['Volume']/1e6,
                                 marker_color='rgba(26, 118, 255, 0.8)',
                                 yaxis='y'
                             ),
                             go.Scatter(
                                 name='Transactions',
-                                x=daily_data['Day'],
-                                y=daily_data['Count'],
+                                x=daily_trend['Day'],
+                                y=daily_trend['Count'],
                                 mode='lines+markers',
                                 marker_color='rgba(255, 128, 0, 0.8)',
                                 yaxis='y2'
@@ -503,9 +412,9 @@ app.layout = dbc.Container([
                     ),
                     html.Div([
                         html.P([
-                            "Peak Day: Friday ",
+                            f"Peak Day: {peak(daily_trend, 'Day', 'Volume')} ",
                             html.Span(
-                                f"(KES {daily_data['Volume'].max()/1e6:.1f}M, {daily_data['Count'].max():,} transactions)",
+                                f"(KES {daily_trend['Volume'].max()/1e6:.1f}M, {daily_trend['Count'].max():,} transactions)",
                                 className="text-muted"
                             )
                         ], className="mb-0 mt-3 regular-text")
@@ -519,11 +428,12 @@ app.layout = dbc.Container([
             dbc.Card([
                 dbc.CardHeader("Hourly Transaction Pattern"),
                 dbc.CardBody([
-                    dcc.Graph(
+                    trend_graph(
+                        'hourly', hourly_trend, forecast=DASHBOARD['forecasts'].get('Portfolio'),
                         figure=go.Figure(data=[
                             go.Scatter(
-                                x=hourly_data['Hour'],
-                                y=hourly_data['Volume']/1e6,
+                                x=hourly_trend['Hour'],
+                                y=hourly_trend['Volume']/1e6,
                                 mode='lines+markers',
                                 name='Volume',
                                 marker=dict(
@@ -537,8 +447,8 @@ app.layout = dbc.Container([
                                 yaxis='y'
                             ),
                             go.Scatter(
-                                x=hourly_data['Hour'],
-                                y=hourly_data['Count'],
+                                x=hourly_trend['Hour'],
+                                y=hourly_trend['Count'],
                                 mode='lines+markers',
                                 name='Transaction Count',
                                 marker=dict(
@@ -577,22 +487,22 @@ app.layout = dbc.Container([
                             xaxis=dict(
                                 tickangle=-45,
                                 tickmode='array',
-                                ticktext=[hour for i, hour in enumerate(hourly_data['Hour']) if i % 2 == 0],
-                                tickvals=[i for i in range(len(hourly_data)) if i % 2 == 0]
+                                ticktext=[hour for i, hour in enumerate(hourly_trend['Hour']) if i % 2 == 0],
+                                tickvals=[i for i in range(len(hourly_trend)) if i % 2 == 0]
                             )
                         )
                     ),
                     html.Div([
                         html.P([
-                            "Peak Volume: 2:30 PM ",
+                            f"Peak Volume: {peak(hourly_trend, 'Hour', 'Volume').replace(':00 ', ' ')} ",
                             html.Span(
-                                f"(KES {hourly_data['Volume'].max()/1e6:.1f}M)",
+                                f"(KES {hourly_trend['Volume'].max()/1e6:.1f}M)",
                                 className="text-muted"
                             ),
                             html.Br(),
-                            "Peak Transactions: 11:30 AM ",
+                            f"Peak Transactions: {peak(hourly_trend, 'Hour', 'Count').replace(':00 ', ' ')} ",
                             html.Span(
-                                f"({hourly_data['Count'].max():,} transactions)",
+                                f"({hourly_trend['Count'].max():,} transactions)",
                                 className="text-muted"
                             )
                         ], className="mb-0 mt-3 regular-text")
@@ -602,6 +512,18 @@ app.layout = dbc.Container([
         ], width=6)
     ], className="mb-4"),
 
+    # Weekly Activity Heatmap (transaction-level data only)
+    dbc.Row([
+        dbc.Col([
+            dbc.Card([
+                dbc.CardHeader("Weekly Activity Pattern"),
+                dbc.CardBody([
+                    activity_graph('portfolio', DASHBOARD['activity']['Portfolio'])
+                ])
+            ], className="shadow-sm")
+        ], width=12)
+    ], className="mb-4") if DASHBOARD['activity'] is not None else None,
+
     # Industry and Geographic Distribution
     dbc.Row([
         # Industry Analysis
@@ -651,7 +573,8 @@ app.layout = dbc.Container([
             dbc.Card([
                 dbc.CardHeader("Geographic Distribution"),
                 dbc.CardBody([
-                    dcc.Graph(
+                    trend_graph(
+                        'country', country_data.rename(columns={'Volume_KES': 'Volume', 'Transactions': 'Count'}),
                         figure=go.Figure(data=[
                             go.Bar(
                                 name='Volume (KES)',
@@ -745,7 +668,7 @@ app.layout = dbc.Container([
                     ),
                     html.Div([
                         *[
-                            html.Img(
+                            dcc.Link(html.Img(
                                 src=f'/assets/{CLIENT_LOGOS.get(client, "Others.jpg")}',
                                 id=f'client-logo-{client}',
                                 style={
@@ -759,7 +682,7 @@ app.layout = dbc.Container([
                                     'backgroundColor': '#f8f9fa',
                                     'borderRadius': '5px'
                                 }
-                            ) for client in client_data['Client']
+                            ), href=client_href(client)) for client in client_data['Client']
                         ]
                     ], style={
                         'display': 'flex',
@@ -874,7 +797,7 @@ app.layout = dbc.Container([
                                         html.Div([
                                             f"KES {recipients_data.loc[recipients_data['Bank'] == bank, 'Volume'].iloc[0]/1e6:.1f}M",
                                             html.Br(),
-                                            f"({recipients_data.loc[recipients_data['Bank'] == bank, 'Market_Share'].iloc[0]:.1f}%)"
+                                            f"({recipient_shares[bank]:.1f}%)"
                                         ], className="text-muted small text-center")
                                     ], style={
                                         'marginBottom': '15px',
@@ -899,8 +822,110 @@ app.layout = dbc.Container([
         ], width=12)
     ], className="mb-4"),
 
+    # Remitter Cohort Retention (transaction-level data only)
+    dbc.Row([
+        dbc.Col([
+            dbc.Card([
+                dbc.CardHeader("Remitter Cohort Retention"),
+                dbc.CardBody([
+                    dcc.Graph(figure=cohort_heatmap(DASHBOARD['cohorts']))
+                ])
+            ], className="shadow-sm")
+        ], width=12)
+    ], className="mb-4") if DASHBOARD['cohorts'] is not None else None,
+
+    # Corridor Money Flow (transaction-level data only)
+    dbc.Row([
+        dbc.Col([
+            dbc.Card([
+                dbc.CardHeader("Corridor Money Flow"),
+                dbc.CardBody([
+                    dcc.Graph(figure=corridor_sankey(DASHBOARD['corridors']))
+                ])
+            ], className="shadow-sm")
+        ], width=12)
+    ], className="mb-4") if DASHBOARD['corridors'] is not None else None,
+
 ], fluid=True, className="p-4")
 
+
+# Page routing: / serves the portfolio view, /client/<name> a partner view
+def render_page(pathname):
+    if pathname and pathname.startswith('/client/'):
+        client = unquote(pathname[len('/client/'):])
+        if client not in CLIENT_SLICES:
+            return dbc.Container([
+                html.H2(f"Unknown client: {client}", className="text-center mt-5"),
+                html.P(dcc.Link("← All clients", href='/'), className="text-center regular-text")
+            ])
+        return client_layout(client)
+    return main_layout
+
+
+# Building every client page up front costs about 0.1 s per client at import.
+# Off by default so cold start stays short; pages are built on first visit
+# and cached. WARM_CLIENT_PAGES=1 builds them in the preloaded master
+# instead, where the forked workers share them.
+WARM_CLIENT_PAGES = os.environ.get('WARM_CLIENT_PAGES') == '1'
+
+
+# App factory. Data and the portfolio layout are built at import time, so
+# under `gunicorn --preload` they are built once in the master and shared
+# copy-on-write with the forked workers.
+def create_app(warm_client_pages=WARM_CLIENT_PAGES):
+    app = dash.Dash(
+        __name__,
+        external_stylesheets=[
+            dbc.themes.FLATLY,
+            'https://fonts.googleapis.com/css2?family=Bebas+Neue&display=swap'
+        ],
+        # Page content is rendered by the routing callback
+        suppress_callback_exceptions=True
+    )
+    app.index_string = INDEX_STRING
+    app.layout = html.Div([
+        dcc.Location(id='url', refresh=False),
+        html.Div(id='page-content')
+    ])
+    app.callback(
+        Output('page-content', 'children'),
+        Input('url', 'pathname')
+    )(timed_callback(render_page))
+
+    # Volume/Count, units and overlay toggles run in the browser
+    app.clientside_callback(
+        ClientsideFunction(namespace='bizdash', function_name='updateTrendFigures'),
+        Output({'type': 'trend-graph', 'index': ALL}, 'figure'),
+        Input('trend-metric', 'value'),
+        Input('trend-units', 'value'),
+        Input('trend-series', 'value'),
+        State({'type': 'trend-graph', 'index': ALL}, 'figure'),
+        State({'type': 'trend-data', 'index': ALL}, 'data')
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace='bizdash', function_name='updateActivityHeatmaps'),
+        Output({'type': 'activity-heatmap', 'index': ALL}, 'figure'),
+        Input('trend-metric', 'value'),
+        Input('trend-units', 'value'),
+        Input({'type': 'activity-success', 'index': ALL}, 'value'),
+        State({'type': 'activity-heatmap', 'index': ALL}, 'figure'),
+        State({'type': 'activity-data', 'index': ALL}, 'data')
+    )
+
+    # Request, callback and query timings on /metrics
+    instrument(app.server)
+
+    # Build every client page up front instead of on the first visit
+    if warm_client_pages:
+        for client in CLIENT_SLICES:
+            client_layout(client)
+    return app
+
+
+# Render deployment
+app = create_app()
+server = app.server
+
 # Run the app
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 8080))
@@ -0,0 +1,124 @@
+// Clientside callbacks for presentational toggles on the trend charts.
+// Trace 0 is the primary series (Volume or Count), trace 1 the overlay line,
+// any later traces are volume forecasts.
+(function () {
+    var UNITS = {
+        M: {divisor: 1e6, label: 'Millions'},
+        B: {divisor: 1e9, label: 'Billions'}
+    };
+    // Date.getDay() order
+    var WEEKDAYS = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'];
+
+    function tomorrow() {
+        var day = new Date();
+        day.setDate(day.getDate() + 1);
+        return WEEKDAYS[day.getDay()];
+    }
+
+    function restyle(figure, data, metric, unit, showOverlay) {
+        if (!figure || !data) {
+            return figure;
+        }
+        var primary = Object.assign({}, figure.data[0]);
+        var title;
+        if (metric === 'Count') {
+            primary.y = data.Count;
+            primary.name = 'Transactions';
+            title = 'Number of Transactions';
+        } else {
+            primary.y = data.Volume.map(function (value) {
+                return value / unit.divisor;
+            });
+            primary.name = 'Volume';
+            title = 'Volume (KES ' + unit.label + ')';
+        }
+
+        var traces = figure.data.slice();
+        traces[0] = primary;
+        if (traces.length > 1) {
+            traces[1] = Object.assign({}, traces[1], {visible: showOverlay});
+        }
+
+        // Forecast traces carry raw KES values in meta; they are volume-only.
+        // Intraday forecasts exist for every weekday; only tomorrow's shows.
+        var day = tomorrow();
+        for (var i = 2; i < traces.length; i++) {
+            var meta = traces[i].meta;
+            if (!meta || !meta.raw) {
+                continue;
+            }
+            var scaled = Object.assign({}, traces[i], {
+                y: meta.raw.map(function (value) {
+                    return value / unit.divisor;
+                }),
+                visible: metric !== 'Count' && (!meta.weekday || meta.weekday === day)
+            });
+            if (meta.rawUpper) {
+                scaled.error_y = Object.assign({}, traces[i].error_y, {
+                    array: meta.rawUpper.map(function (value) {
+                        return value / unit.divisor;
+                    }),
+                    arrayminus: meta.rawLower.map(function (value) {
+                        return value / unit.divisor;
+                    })
+                });
+            }
+            traces[i] = scaled;
+        }
+
+        var yaxis = Object.assign({}, figure.layout.yaxis);
+        yaxis.title = Object.assign({}, yaxis.title, {text: title});
+        return Object.assign({}, figure, {
+            data: traces,
+            layout: Object.assign({}, figure.layout, {yaxis: yaxis})
+        });
+    }
+
+    // Activity heatmaps swap z between the raw Volume, Count and success
+    // rate grids
+    function restyleHeatmap(figure, data, metric, unit, showSuccess) {
+        if (!figure || !data) {
+            return figure;
+        }
+        var z;
+        var title;
+        if (showSuccess) {
+            z = data.Success_Rate;
+            title = 'Success Rate (%)';
+        } else if (metric === 'Count') {
+            z = data.Count;
+            title = 'Transactions';
+        } else {
+            z = data.Volume.map(function (row) {
+                return row.map(function (value) {
+                    return value / unit.divisor;
+                });
+            });
+            title = 'KES ' + unit.label;
+        }
+        var trace = Object.assign({}, figure.data[0], {z: z});
+        trace.colorbar = Object.assign({}, trace.colorbar, {
+            title: Object.assign({}, (trace.colorbar || {}).title, {text: title})
+        });
+        return Object.assign({}, figure, {data: [trace]});
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        bizdash: {
+            updateTrendFigures: function (metric, units, series, figures, data) {
+                var unit = UNITS[units] || UNITS.M;
+                var showOverlay = (series || []).indexOf('overlay') !== -1;
+                return figures.map(function (figure, i) {
+                    return restyle(figure, data[i], metric, unit, showOverlay);
+                });
+            },
+            updateActivityHeatmaps: function (metric, units, success, figures, data) {
+                var unit = UNITS[units] || UNITS.M;
+                return figures.map(function (figure, i) {
+                    var showSuccess = ((success || [])[i] || []).indexOf('success') !== -1;
+                    return restyleHeatmap(figure, data[i], metric, unit, showSuccess);
+                });
+            }
+        }
+    });
+})();
@@ -0,0 +1,87 @@
+# Import-time report
+# Runs `python -X importtime -c "import app2"` in a fresh interpreter and
+# summarizes import time per top-level package.
+#
+#   python benchmarks/importtime.py [--top 15] [--module app2] [--repeat 5] [--baseline DIR]
+#
+# Each tree is measured --repeat times and the fastest run kept, which damps
+# disk-cache and scheduler noise. --baseline takes a checkout of an earlier revision (e.g. from
+# `git worktree add /tmp/baseline <rev>`) and reports it next to this tree.
+#
+# The last committed run is in benchmarks/importtime_report.txt.
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(module, root=ROOT):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=root, capture_output=True, text=True, check=True
+    )
+    # Lines look like: "import time:  self [us] |  cumulative | imported package"
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name[1:].rstrip()
+        rows.append((int(self_us), int(cumulative_us), len(name) - len(name.lstrip()), name.strip()))
+    return rows
+
+
+# Self times add up to the whole import, so they are attributed to each
+# module's top-level package. A package's cumulative time sums its outermost
+# imports, those not nested inside another module of the same package.
+# importtime lists children before their parent, so walking the rows in
+# reverse meets every parent first.
+def by_package(rows):
+    self_by_package = defaultdict(int)
+    cumulative_by_package = defaultdict(int)
+    parents = []
+    for self_us, cumulative_us, depth, name in reversed(rows):
+        package = name.split('.')[0]
+        while parents and parents[-1][0] >= depth:
+            parents.pop()
+        if not parents or parents[-1][1] != package:
+            cumulative_by_package[package] += cumulative_us
+        parents.append((depth, package))
+        self_by_package[package] += self_us
+    return self_by_package, cumulative_by_package
+
+
+def summarize(rows, top, baseline=None):
+    self_by_package, cumulative_by_package = by_package(rows)
+    total = sum(self_by_package.values())
+    lines = [f'Total import time: {total / 1000:.1f} ms']
+    header = f'{"package":<30}{"self ms":>12}{"cumulative ms":>15}'
+    if baseline is not None:
+        baseline_self, baseline_cumulative = by_package(baseline)
+        lines.append(f'Baseline import time: {sum(baseline_self.values()) / 1000:.1f} ms')
+        header += f'{"baseline self":>15}{"baseline cum.":>15}'
+    lines += ['', header]
+    for package, self_us in sorted(self_by_package.items(), key=lambda item: -item[1])[:top]:
+        line = f'{package:<30}{self_us / 1000:>12.1f}{cumulative_by_package[package] / 1000:>15.1f}'
+        if baseline is not None:
+            line += f'{baseline_self.get(package, 0) / 1000:>15.1f}{baseline_cumulative.get(package, 0) / 1000:>15.1f}'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Summarize import time per top-level package')
+    parser.add_argument('--module', default='app2')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', help='checkout of an earlier revision to compare against')
+    args = parser.parse_args()
+
+    def fastest(root=ROOT):
+        runs = [measure(args.module, root) for _ in range(args.repeat)]
+        return min(runs, key=lambda rows: sum(row[0] for row in rows))
+
+    print(summarize(fastest(), args.top, fastest(args.baseline) if args.baseline else None))
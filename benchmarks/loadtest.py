@@ -0,0 +1,217 @@
+# Load test
+# Starts the dashboard under gunicorn on localhost for every combination of
+# worker count and worker class, replays concurrent viewer sessions against
+# it and reports p50/p95/p99 latency and requests/sec per endpoint.
+#
+#   python benchmarks/loadtest.py --workers 1,2,4 --worker-classes sync,gthread,gevent \
+#       --users 20 --duration 30
+#
+# A session opens the page, fetches _dash-layout, _dash-dependencies and the
+# /assets logos, then fires the routing callback for a random client page.
+# Only the standard library is used on the client side; the gevent worker
+# class needs gevent installed and is skipped otherwise.
+#
+# The viewers are threads spread over --client-processes processes (one per
+# CPU by default), each opening a new connection per request. The client
+# shares the machine with the server, so a req/s figure that stops growing
+# with workers may be the client's limit rather than the server's: check
+# that the client processes are not saturating a core.
+import argparse
+import importlib.util
+import json
+import math
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data import CLIENT_LOGOS  # noqa: E402
+
+ASSET_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.PNG')
+ASSETS = sorted(name for name in os.listdir(os.path.join(ROOT, 'assets')) if name.endswith(ASSET_EXTENSIONS))
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers, worker_class, threads, port):
+    command = [
+        sys.executable, '-m', 'gunicorn',
+        '--config', 'gunicorn.conf.py',
+        '--bind', f'127.0.0.1:{port}',
+        '--workers', str(workers),
+        '--worker-class', worker_class,
+        '--threads', str(threads),
+        '--log-level', 'warning',
+        'app2:server'
+    ]
+    return subprocess.Popen(command, cwd=ROOT)
+
+
+def wait_ready(base, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(base + '/', timeout=5) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.5)
+    raise RuntimeError(f'server at {base} did not become ready in {timeout}s')
+
+
+# Session steps
+def _routing_body(pathname):
+    return json.dumps({
+        'output': 'page-content.children',
+        'outputs': {'id': 'page-content', 'property': 'children'},
+        'inputs': [{'id': 'url', 'property': 'pathname', 'value': pathname}],
+        'changedPropIds': ['url.pathname'],
+        'state': []
+    }).encode()
+
+
+def session_steps():
+    pathname = random.choice(['/'] + [f'/client/{client}' for client in CLIENT_LOGOS])
+    return [
+        ('page', '/', None),
+        ('_dash-layout', '/_dash-layout', None),
+        ('_dash-dependencies', '/_dash-dependencies', None),
+        *[('assets', f'/assets/{name}', None) for name in ASSETS],
+        ('callback', '/_dash-update-component', _routing_body(pathname)),
+    ]
+
+
+def _request(base, path, body):
+    request = urllib.request.Request(base + path, data=body)
+    if body is not None:
+        request.add_header('Content-Type', 'application/json')
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+        return response.status
+
+
+def run_user(base, deadline, samples):
+    while time.monotonic() < deadline:
+        for name, path, body in session_steps():
+            start = time.perf_counter()
+            try:
+                ok = _request(base, path, body) == 200
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                ok = False
+            samples.append((name, time.perf_counter() - start, ok))
+            if time.monotonic() >= deadline:
+                return
+
+
+def run_clients(base, duration, users):
+    samples = []
+    deadline = time.monotonic() + duration
+    pool = [threading.Thread(target=run_user, args=(base, deadline, samples)) for _ in range(users)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return samples
+
+
+# Reporting
+def percentile(values, q):
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    index = min(int(round(q / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(samples, duration):
+    endpoints = {}
+    for name, seconds, ok in samples:
+        endpoints.setdefault(name, []).append((seconds, ok))
+    endpoints['all'] = [(seconds, ok) for _, seconds, ok in samples]
+
+    summary = {}
+    for name, rows in endpoints.items():
+        latencies = [seconds * 1000 for seconds, _ in rows]
+        summary[name] = {
+            'requests': len(rows),
+            'errors': sum(not ok for _, ok in rows),
+            'rps': len(rows) / duration,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99)
+        }
+    return summary
+
+
+def run(workers, worker_class, threads, users, duration, client_processes):
+    port = _free_port()
+    base = f'http://127.0.0.1:{port}'
+    server = start_server(workers, worker_class, threads, port)
+    try:
+        wait_ready(base)
+        # Users split as evenly as possible over the client processes
+        processes = max(1, min(client_processes, users))
+        shares = [users // processes + (i < users % processes) for i in range(processes)]
+        with multiprocessing.Pool(processes) as pool:
+            started = time.monotonic()
+            batches = pool.starmap(run_clients, [(base, duration, share) for share in shares])
+            elapsed = time.monotonic() - started
+        return summarize([sample for batch in batches for sample in batch], elapsed)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def print_report(label, summary):
+    print(f'\n{label}')
+    print(f'{"endpoint":<22}{"requests":>10}{"errors":>8}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}')
+    for name, row in summary.items():
+        print(
+            f'{name:<22}{row["requests"]:>10}{row["errors"]:>8}{row["rps"]:>10.1f}'
+            f'{row["p50_ms"]:>10.1f}{row["p95_ms"]:>10.1f}{row["p99_ms"]:>10.1f}'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test the dashboard on localhost')
+    parser.add_argument('--workers', default='1,2,4', help='comma-separated worker counts')
+    parser.add_argument('--worker-classes', default='sync,gthread,gevent', help='comma-separated gunicorn worker classes')
+    parser.add_argument('--threads', type=int, default=4, help='threads per gthread worker')
+    parser.add_argument('--users', type=int, default=20, help='concurrent simulated viewers')
+    parser.add_argument('--duration', type=float, default=30, help='seconds per configuration')
+    parser.add_argument('--client-processes', type=int, default=os.cpu_count() or 1,
+                        help='processes the simulated viewers are spread over')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+    print(
+        f'{args.users} viewers over {min(args.client_processes, args.users)} client process(es) on this machine, '
+        'a new connection per request: req/s can be capped by the client, not only the server'
+    )
+
+    results = {}
+    for worker_class in args.worker_classes.split(','):
+        if worker_class == 'gevent' and importlib.util.find_spec('gevent') is None:
+            print('\nskipping gevent: gevent is not installed')
+            continue
+        for workers in map(int, args.workers.split(',')):
+            threads = args.threads if worker_class == 'gthread' else 1
+            label = f'{worker_class} x {workers} workers' + (f' x {threads} threads' if threads > 1 else '')
+            results[label] = run(workers, worker_class, threads, args.users, args.duration, args.client_processes)
+            print_report(label, results[label])
+
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump(results, output, indent=2)
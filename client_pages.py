@@ -0,0 +1,223 @@
+# Imports
+from functools import lru_cache
+from urllib.parse import quote
+
+import plotly.graph_objects as go
+from dash import dcc, html
+import dash_bootstrap_components as dbc
+
+from data import CLIENT_LOGOS
+from components import activity_graph, trend_controls, trend_graph
+
+BLUE = 'rgba(26, 118, 255, 0.8)'
+ORANGE = 'rgba(255, 128, 0, 0.8)'
+
+
+def client_href(client):
+    return f'/client/{quote(client)}'
+
+
+# Figure builders
+def _dual_axis_figure(frame, key, title, height=350, bar=True):
+    volume = go.Bar if bar else go.Scatter
+    volume_style = dict(marker_color=BLUE) if bar else dict(
+        mode='lines+markers',
+        marker=dict(size=6, color=BLUE),
+        line=dict(width=2, color=BLUE)
+    )
+    return go.Figure(data=[
+        volume(
+            name='Volume',
+            x=frame[key],
+            y=frame['Volume']/1e6,
+            yaxis='y',
+            **volume_style
+        ),
+        go.Scatter(
+            name='Transactions',
+            x=frame[key],
+            y=frame['Count'],
+            mode='lines+markers',
+            marker=dict(size=6, color=ORANGE),
+            line=dict(width=2, color=ORANGE),
+            yaxis='y2'
+        )
+    ]).update_layout(
+        title=title,
+        yaxis=dict(
+            title='Volume (KES Millions)',
+            titlefont=dict(color=BLUE),
+            tickfont=dict(color=BLUE)
+        ),
+        yaxis2=dict(
+            title='Number of Transactions',
+            titlefont=dict(color=ORANGE),
+            tickfont=dict(color=ORANGE),
+            overlaying='y',
+            side='right'
+        ),
+        height=height,
+        margin=dict(l=50, r=50, t=50, b=30),
+        legend=dict(
+            orientation="h",
+            y=1.1,
+            x=0.5,
+            xanchor='center'
+        )
+    )
+
+
+def _bank_figure(frame):
+    return go.Figure(
+        go.Treemap(
+            labels=frame['Bank'],
+            parents=[''] * len(frame),
+            values=frame['Volume'],
+            textinfo='label+value+percent parent',
+            hovertemplate=(
+                "<b>%{label}</b><br>" +
+                "Volume: KES %{value:,.2f}<br>" +
+                "Share: %{percentParent:.1%}<extra></extra>"
+            ),
+            marker=dict(
+                colors=frame['Volume'],
+                colorscale='Blues',
+                showscale=True
+            ),
+            textfont=dict(size=13)
+        )
+    ).update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=20, b=20)
+    )
+
+
+def client_figures(slices):
+    return {
+        'monthly': _dual_axis_figure(slices['monthly'], 'Month', 'Monthly Volume and Transactions', height=400),
+        'daily': _dual_axis_figure(slices['daily'], 'Day', 'Daily Transaction Patterns'),
+        'hourly': _dual_axis_figure(slices['hourly'], 'Hour', 'Hourly Transaction Pattern', bar=False).update_layout(
+            xaxis_tickangle=-45,
+            margin=dict(l=50, r=50, t=50, b=100)
+        ),
+        'country': _dual_axis_figure(slices['country'], 'Country', 'Country-wise Distribution', height=450).update_layout(
+            xaxis_tickangle=-45,
+            margin=dict(l=50, r=50, t=50, b=100)
+        ),
+        'bank': _bank_figure(slices['bank'])
+    }
+
+
+def _card(header, figure, width, trend=None, forecast=None):
+    if trend:
+        graph = trend_graph(trend[0], trend[1], forecast=forecast, figure=figure)
+    else:
+        graph = dcc.Graph(figure=figure)
+    return dbc.Col([
+        dbc.Card([
+            dbc.CardHeader(header),
+            dbc.CardBody([graph])
+        ], className="shadow-sm")
+    ], width=width)
+
+
+# Client page layout. Figures are built once per client and reused for every
+# visit, so serving a partner page costs no aggregation work.
+@lru_cache(maxsize=None)
+def client_layout(client):
+    slices = CLIENT_SLICES[client]
+    figures = client_figures(slices)
+    monthly = slices['monthly']
+    forecast = CLIENT_FORECASTS.get(client)
+    activity = CLIENT_ACTIVITY.get(client)
+    return dbc.Container([
+        # Header
+        dbc.Row([
+            dbc.Col([
+                html.Div([
+                    dcc.Link("← All clients", href='/', className="regular-text"),
+                ], className="mb-3"),
+                html.Div([
+                    html.Img(
+                        src=f'/assets/{CLIENT_LOGOS.get(client, "Others.jpg")}',
+                        style={'height': '100px', 'objectFit': 'contain'}
+                    )
+                ], style={
+                    'display': 'flex',
+                    'justifyContent': 'center',
+                    'alignItems': 'center',
+                    'padding': '20px'
+                }),
+                html.H1(
+                    f"{client} Transfer Analysis",
+                    className="text-primary text-center mb-4",
+                    style={'letterSpacing': '2px'}
+                ),
+                html.P(
+                    "Estimated from the portfolio profile and this client's market share; "
+                    "set TRANSACTIONS_PATH for transaction-level figures.",
+                    className="regular-text text-muted text-center"
+                ) if SLICE_SOURCE['source'] == 'estimated' else None
+            ])
+        ]),
+
+        # Key Metrics
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardBody([
+                        html.H5("Total Transactions", className="card-title text-center"),
+                        html.H2(f"{monthly['Count'].sum():,.0f}", className="text-primary text-center")
+                    ])
+                ], className="shadow-sm")
+            ]),
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardBody([
+                        html.H5("Total Volume (KES)", className="card-title text-center"),
+                        html.H2(f"{monthly['Volume'].sum()/1e6:,.1f}M", className="text-primary text-center")
+                    ])
+                ], className="shadow-sm")
+            ])
+        ], className="mb-4"),
+
+        trend_controls(),
+        dbc.Row([
+            _card("Monthly Transaction Analysis", figures['monthly'], 12, ('monthly', monthly), forecast)
+        ], className="mb-4"),
+        dbc.Row([
+            _card("Daily Transaction Distribution", figures['daily'], 6, ('daily', slices['daily'])),
+            _card("Hourly Transaction Pattern", figures['hourly'], 6, ('hourly', slices['hourly']), forecast)
+        ], className="mb-4"),
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader("Weekly Activity Pattern"),
+                    dbc.CardBody([activity_graph(client, activity)])
+                ], className="shadow-sm")
+            ], width=12)
+        ], className="mb-4") if activity is not None else None,
+        dbc.Row([
+            _card("Geographic Distribution", figures['country'], 6, ('country', slices['country'])),
+            _card("Bank Recipients Analysis", figures['bank'], 6)
+        ], className="mb-4"),
+    ], fluid=True, className="p-4")
+
+
+# Slices registered by the app after each refresh; registering new slices
+# drops the cached layouts built from the previous ones
+CLIENT_SLICES = {}
+CLIENT_FORECASTS = {}
+CLIENT_ACTIVITY = {}
+SLICE_SOURCE = {'source': None}
+
+
+def register_slices(slices, source, forecasts=None, activity=None):
+    CLIENT_SLICES.clear()
+    CLIENT_SLICES.update(slices)
+    CLIENT_FORECASTS.clear()
+    CLIENT_FORECASTS.update(forecasts or {})
+    CLIENT_ACTIVITY.clear()
+    CLIENT_ACTIVITY.update(activity or {})
+    SLICE_SOURCE['source'] = source
+    client_layout.cache_clear()
@@ -0,0 +1,81 @@
+# Imports
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from activity import NAT
+
+
+# Cohort engine
+# Works on the compact transaction table: ids are sorted integer codes, so
+# each (id, month) activity pair packs into one int64 and a single np.unique
+# yields the sorted activity set. First months fall out of the id runs and the
+# cohort x active-month matrix is one bincount.
+def cohort_matrix(table, id_column='Remitter_ID'):
+    ids = table['columns'][id_column].astype(np.int64)
+    timestamps = table['columns']['Timestamp']
+    valid = (ids >= 0) & (timestamps != NAT)
+    ids = ids[valid]
+    months = timestamps[valid].view('datetime64[ns]').astype('datetime64[M]').astype(np.int64)
+    if not len(ids):
+        return pd.DataFrame()
+
+    start = months.min()
+    months = months - start
+    n_months = int(months.max()) + 1
+
+    pairs = np.unique(ids * n_months + months)
+    pair_ids, pair_months = np.divmod(pairs, n_months)
+
+    # Pairs are sorted by id then month, so each id's run starts at its first month
+    starts = np.flatnonzero(np.r_[True, pair_ids[1:] != pair_ids[:-1]])
+    first_months = np.repeat(pair_months[starts], np.diff(np.r_[starts, len(pairs)]))
+
+    counts = np.bincount(
+        first_months * n_months + pair_months, minlength=n_months * n_months
+    ).reshape(n_months, n_months)
+    # Labelled like the monthly slices ('January 2025')
+    labels = pd.to_datetime(np.arange(start, start + n_months).astype('datetime64[M]')).strftime('%B %Y')
+    return pd.DataFrame(
+        counts,
+        index=pd.Index(labels, name='First_Month'),
+        columns=pd.Index(labels, name='Active_Month')
+    )
+
+
+# Share of each cohort still active in later months; a cohort's size is its
+# count in its own first month
+def retention_rates(matrix):
+    sizes = np.diag(matrix.to_numpy())
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rates = matrix.to_numpy() / sizes[:, None] * 100
+    return pd.DataFrame(rates, index=matrix.index, columns=matrix.columns)
+
+
+def cohort_heatmap(matrix):
+    rates = retention_rates(matrix)
+    # Months before a cohort's first month are structurally empty
+    rates = rates.where(np.triu(np.ones(rates.shape, dtype=bool)))
+    return go.Figure(
+        go.Heatmap(
+            z=rates.to_numpy(),
+            x=rates.columns,
+            y=rates.index,
+            customdata=matrix.to_numpy(),
+            colorscale='Blues',
+            zmin=0,
+            zmax=100,
+            hovertemplate=(
+                "<b>Cohort %{y}</b><br>" +
+                "Active in %{x}: %{customdata:,} remitters<br>" +
+                "Retention: %{z:.1f}%<extra></extra>"
+            ),
+            colorbar=dict(title='Retention (%)')
+        )
+    ).update_layout(
+        title='Remitter Retention by First Month',
+        xaxis_title='Active Month',
+        yaxis=dict(title='First Month', autorange='reversed'),
+        height=450,
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
@@ -0,0 +1,103 @@
+# Imports
+import numpy as np
+from dash import dcc, html
+import dash_bootstrap_components as dbc
+
+from forecasting import FORECAST_OVERLAYS
+from activity import activity_heatmap
+
+# Trend charts (monthly, daily, hourly, country) are restyled in the browser
+# by the clientside callback in assets/dashboard.js: the raw Volume and Count
+# series ship once in a Store and the display controls below never reach the
+# server. The controls apply to these charts and the activity heatmaps; the
+# headline figures keep their own fixed units.
+
+
+def trend_controls():
+    return dbc.Card([
+        dbc.CardBody([
+            dbc.Row([
+                dbc.Col([
+                    html.Span("Metric: ", className="regular-text"),
+                    dcc.RadioItems(
+                        id='trend-metric',
+                        options=[
+                            {'label': ' Volume', 'value': 'Volume'},
+                            {'label': ' Count', 'value': 'Count'}
+                        ],
+                        value='Volume',
+                        inline=True,
+                        inputStyle={'marginLeft': '10px'},
+                        className="regular-text"
+                    )
+                ], width='auto'),
+                dbc.Col([
+                    html.Span("Chart units: ", className="regular-text"),
+                    dcc.RadioItems(
+                        id='trend-units',
+                        options=[
+                            {'label': ' KES Millions', 'value': 'M'},
+                            {'label': ' KES Billions', 'value': 'B'}
+                        ],
+                        value='M',
+                        inline=True,
+                        inputStyle={'marginLeft': '10px'},
+                        className="regular-text"
+                    )
+                ], width='auto'),
+                dbc.Col([
+                    dcc.Checklist(
+                        id='trend-series',
+                        options=[{'label': ' Show overlay line', 'value': 'overlay'}],
+                        value=['overlay'],
+                        inline=True,
+                        className="regular-text"
+                    )
+                ], width='auto')
+            ], justify='center')
+        ])
+    ], className="shadow-sm mb-4")
+
+
+def trend_graph(index, frame, forecast=None, **graph_kwargs):
+    if forecast is not None and index in FORECAST_OVERLAYS:
+        graph_kwargs['figure'] = FORECAST_OVERLAYS[index](graph_kwargs['figure'], forecast)
+    return html.Div([
+        dcc.Store(
+            id={'type': 'trend-data', 'index': index},
+            data={
+                'Volume': frame['Volume'].tolist(),
+                'Count': frame['Count'].tolist()
+            }
+        ),
+        dcc.Graph(id={'type': 'trend-graph', 'index': index}, **graph_kwargs)
+    ])
+
+
+# Day-of-week x time-of-day heatmap, restyled by the same Volume/Count and
+# unit controls, with its own switch to colour by success rate. Empty bins
+# have no success rate and ship as null.
+def activity_graph(index, grid):
+    success_rate = grid['Success_Rate'].astype(object)
+    success_rate[np.isnan(grid['Success_Rate'])] = None
+    return html.Div([
+        dcc.Checklist(
+            id={'type': 'activity-success', 'index': index},
+            options=[{'label': ' Colour by success rate', 'value': 'success'}],
+            value=[],
+            inline=True,
+            className="regular-text"
+        ),
+        dcc.Store(
+            id={'type': 'activity-data', 'index': index},
+            data={
+                'Volume': grid['Volume'].tolist(),
+                'Count': grid['Count'].tolist(),
+                'Success_Rate': success_rate.tolist()
+            }
+        ),
+        dcc.Graph(
+            id={'type': 'activity-heatmap', 'index': index},
+            figure=activity_heatmap(grid)
+        )
+    ])
@@ -0,0 +1,102 @@
+# Imports
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from transactions import AMOUNT_SCALE
+
+STAGES = ('Country', 'Client', 'Bank')
+
+# Missing codes get a node of their own, so every transaction flows through
+# all three stages: a row without a bank is a non-bank payout, as in the
+# bank slices, and an unrecorded country or client shows as 'Unknown'
+MISSING = {'Country': 'Unknown', 'Client': 'Unknown', 'Bank': 'Non-bank payout'}
+
+# Edges carrying less than this share of total volume are folded into an
+# "Other" node so the diagram stays readable as corridors grow
+PRUNE_SHARE = float(os.environ.get('CORRIDOR_PRUNE_SHARE', 0.005))
+
+
+# Corridor aggregate
+# Sparse 3-D (country, client, bank) volume/count aggregate in COO form: only
+# corridors that actually occur are stored. The compact table's integer codes
+# are packed into one int64 key per row and reduced with a single
+# np.unique + bincount, so cost tracks the number of transactions, never the
+# size of the full cross product.
+def corridor_aggregate(table):
+    columns = table['columns']
+    lookups = [np.append(table['lookups'][stage], MISSING[stage]) for stage in STAGES]
+    sizes = [len(lookup) for lookup in lookups]
+    codes = [
+        np.where(columns[stage] < 0, size - 1, columns[stage]).astype(np.int64)
+        for stage, size in zip(STAGES, sizes)
+    ]
+
+    keys = (codes[0] * sizes[1] + codes[1]) * sizes[2] + codes[2]
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    volume = np.bincount(inverse, weights=columns['Amount']) / AMOUNT_SCALE
+    count = np.bincount(inverse)
+
+    rest, bank = np.divmod(unique_keys, sizes[2])
+    country, client = np.divmod(rest, sizes[1])
+    return pd.DataFrame({
+        'Country': lookups[0][country],
+        'Client': lookups[1][client],
+        'Bank': lookups[2][bank],
+        'Volume': volume,
+        'Count': count
+    })
+
+
+# Sankey links: country -> client and client -> bank edges from the sparse
+# aggregate. Small edges fold their outer end (the country, or the bank) into
+# "Other" so each client's inflow and outflow still balance.
+def sankey_links(corridors, min_share=PRUNE_SHARE):
+    threshold = corridors['Volume'].sum() * min_share
+    links = []
+    for source, target, outer in (('Country', 'Client', 'Country'), ('Client', 'Bank', 'Bank')):
+        edges = corridors.groupby([source, target], sort=False, as_index=False)[['Volume', 'Count']].sum()
+        edges[outer] = edges[outer].where(edges['Volume'] >= threshold, 'Other')
+        edges = edges.groupby([source, target], sort=False, as_index=False)[['Volume', 'Count']].sum()
+        links.append(pd.DataFrame({
+            'Source': source + ': ' + edges[source].astype(str),
+            'Target': target + ': ' + edges[target].astype(str),
+            'Volume': edges['Volume'],
+            'Count': edges['Count']
+        }))
+    links = pd.concat(links, ignore_index=True)
+    return links[links['Volume'] > 0]
+
+
+def corridor_sankey(links):
+    nodes = pd.Index(pd.unique(links[['Source', 'Target']].to_numpy().ravel()))
+    return go.Figure(
+        go.Sankey(
+            arrangement='snap',
+            node=dict(
+                label=[node.split(': ', 1)[1] for node in nodes],
+                customdata=list(nodes),
+                hovertemplate="%{customdata}<br>KES %{value:,.0f}<extra></extra>",
+                pad=15,
+                thickness=15
+            ),
+            link=dict(
+                source=nodes.get_indexer(links['Source']),
+                target=nodes.get_indexer(links['Target']),
+                value=links['Volume'],
+                customdata=links['Count'],
+                hovertemplate=(
+                    "%{source.label} → %{target.label}<br>" +
+                    "Volume: KES %{value:,.0f}<br>" +
+                    "Transactions: %{customdata:,}<extra></extra>"
+                ),
+                color='rgba(26, 118, 255, 0.3)'
+            )
+        )
+    ).update_layout(
+        title='Money Flow: Country → Client → Bank',
+        height=550,
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
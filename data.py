@@ -0,0 +1,141 @@
+# Imports
+import os
+
+import pandas as pd
+
+# Logo mappings
+CLIENT_LOGOS = {
+    'Lemfi': 'LEMFI.png',
+    'DLocal': 'DLocal.png',
+    'Tangent': 'Tangent.jpg',
+    'Nala': 'Nala.png',
+    'Brij': 'brij.png',
+    'Cellulant': 'Cellulant.png',
+    'Wapipay':'wapipay.jpg',
+    'Others': 'Others.jpg'
+}
+
+BANK_LOGOS = {
+    'ABSA Bank': 'Absa.png',
+    'Cooperative Bank': 'Coop.jpg',
+    'DT Bank': 'DTB.png',
+    'Equity Bank': 'Equity.png',
+    'Family Bank': 'Familybank.jpeg',
+    'I&M Bank': 'im.png',
+    'KCB Bank': 'KCB.png',
+    'NCBA Bank': 'NCBA.png'
+}
+
+# Monthly data
+monthly_data = pd.DataFrame({
+    'Month': ['January', 'February', 'March', 'April', 'May', 'June', 
+             'July', 'August', 'September', 'October', 'November', 'December'],
+    'Count': [4416, 3709, 4305, 4683, 3325, 2396, 31, 41, 1198, 2147, 3623, 8217],
+    'Volume': [296564946.80, 276359353.66, 278039056.61, 280441910.59, 223579836.58, 
+               143369486.87, 925.00, 3843.65, 22142455.28, 53713252.25, 74217693.61, 69555157.68],
+    'Success_Rate': [96.5, 96.1, 85.2, 91.7, 96.2, 92.0, 38.7, 97.6, 86.6, 97.0, 77.1, 80.1],
+    'Unique_Remitters': [2067, 1762, 1688, 2120, 1309, 1169, 3, 4, 529, 987, 1270, 1457],
+    'Unique_Recipients': [2241, 2080, 2136, 2381, 1865, 1539, 6, 14, 420, 740, 945, 1229]
+})
+
+# Industry data
+industry_data = pd.DataFrame({
+    'Industry': ['Other', 'Banking', 'Real Estate', 'Savings', 'Securities & Insurance',
+                'Retail & Grocery', 'Religious', 'Education', 'Hospitality', 'Medical',
+                'Energy & Heavy Industry', 'Government', 'Telco & Tech'],
+    'Volume': [1461861363.64, 134495270.02, 30405803.67, 44181713.27, 19007552.35,
+               10461967.57, 4470010.73, 4785022.56, 3771930.72, 1829661.46,
+               1812760.27, 515721.32, 389141.00]
+})
+
+# Daily transaction data
+daily_data = pd.DataFrame({
+    'Day': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'],
+    'Volume': [276574448.00, 279786235.00, 240526477.00, 328697945.00, 
+               397293759.00, 208898138.00, 169167368.00],
+    'Count': [5137, 4597, 4153, 5062, 6718, 4670, 3715]
+})
+
+# Hourly data
+hourly_data = pd.DataFrame({
+    'Hour': ['12:00:00 AM', '12:30:00 AM', '1:00:00 AM', '1:30:00 AM', '2:00:00 AM', '2:30:00 AM', 
+            '3:00:00 AM', '3:30:00 AM', '4:00:00 AM', '4:30:00 AM', '5:00:00 AM', '5:30:00 AM', 
+            '6:00:00 AM', '6:30:00 AM', '7:00:00 AM', '7:30:00 AM', '8:00:00 AM', '8:30:00 AM', 
+            '9:00:00 AM', '9:30:00 AM', '10:00:00 AM', '10:30:00 AM', '11:00:00 AM', '11:30:00 AM',
+            '12:00:00 PM', '12:30:00 PM', '1:00:00 PM', '1:30:00 PM', '2:00:00 PM', '2:30:00 PM',
+            '3:00:00 PM', '3:30:00 PM', '4:00:00 PM', '4:30:00 PM', '5:00:00 PM', '5:30:00 PM',
+            '6:00:00 PM', '6:30:00 PM', '7:00:00 PM', '7:30:00 PM', '8:00:00 PM', '8:30:00 PM',
+            '9:00:00 PM', '9:30:00 PM', '10:00:00 PM', '10:30:00 PM', '11:00:00 PM', '11:30:00 PM'],
+    'Volume': [23923595.64, 28073570.30, 20093102.50, 18651483.10, 20284409.18, 18327660.92,
+              21046999.52, 18624234.82, 17169134.74, 15938434.62, 16470431.39, 18256504.64,
+              14473250.50, 16664174.87, 21174240.02, 24384442.52, 28430233.46, 35683605.96,
+              32293483.80, 33624440.10, 35471112.12, 41021127.01, 42365401.43, 47930870.44,
+              38029682.04, 41993842.60, 43313929.16, 35436329.29, 34235004.81, 47425583.34,
+              39225509.52, 40058302.81, 34244174.47, 35949800.94, 31541304.54, 34645475.68,
+              42870360.52, 41022579.30, 40635039.28, 33436334.89, 42422933.78, 45150244.19,
+              35818593.44, 29583004.24, 33139351.87, 31088863.08, 29389421.09, 32641760.13],
+    'Count': [456, 443, 433, 365, 354, 325, 421, 277, 309, 327, 309, 285,
+              246, 287, 298, 356, 392, 495, 478, 480, 524, 598, 669, 897,
+              593, 651, 658, 630, 627, 695, 648, 654, 591, 602, 639, 602,
+              597, 642, 677, 588, 704, 711, 588, 494, 513, 463, 444, 503]
+})
+
+# Failure data
+failure_data = pd.DataFrame({
+    'Reason': ['Insufficient Balance', 'Other', 'System Error', 'Invalid Account', 
+               'Invalid Credit Party', 'Timed Out', 'General Failure', 'SOAP Error', 'Limit Exceeded'],
+    'Count': [2216, 592, 437, 251, 83, 133, 23, 6, 2],
+    'Percentage': [58.3, 15.6, 11.5, 6.6, 2.2, 3.5, 0.6, 0.2, 0.1]
+})
+
+# Country data
+country_data = pd.DataFrame({
+    'Country': ['United Kingdom (GBR)', 'United States (USA)', 'Canada (CAN)', 
+                'Kenya (KEN)', 'Nigeria (NGA)', 'Tanzania (TZA)', 'UAE',
+                'Denmark (DEN)', 'India (IND)'],
+    'Volume_KES': [961197746.35, 422501849.21, 68916278.01, 
+                   32036111.63, 6352832.02, 391069.01, 51955.00,
+                   159767.50, 45998.61],
+    'Transactions': [18050, 7906, 1842, 1339, 395, 6, 2, 4, 2]
+})
+
+# Client data
+client_data = pd.DataFrame({
+    'Client': ['Lemfi', 'DLocal', 'Tangent', 'Nala', 'Wapipay', 'Brij', 
+              'Cellulant', 'Others'],
+    'Volume': [1701947843.25, 410741870.10, 31148619.48, 13119614.16, 
+              15022090.45, 28085.00, 43.00, 0.00],
+    'Transactions': [29281, 4547, 203, 173, 42, 42, 4, 0],
+    'Market_Share': [78.36, 18.91, 1.43, 0.60, 0.69, 0.01, 0.00, 0.00]
+})
+
+# Bank recipients data
+recipients_data = pd.DataFrame({
+    'Bank': ['ABSA Bank', 'Cooperative Bank', 'DT Bank', 'Equity Bank', 
+            'Family Bank', 'I&M Bank', 'KCB Bank', 'NCBA Bank'],
+    'Volume': [7282025.65, 11802956.97, 7677251.81, 24819864.19,
+              9481656.86, 9501100.76, 17038871.74, 11536537.68],
+    'Transactions': [139, 338, 124, 889, 215, 244, 348, 195],
+    'Market_Share': [6.53, 10.58, 6.88, 22.25, 8.50, 8.52, 15.27, 10.34]
+})
+
+# Raw transactions
+# Optional transaction-level export (CSV or Parquet). When it is not configured
+# the dashboard falls back to the summary tables above.
+TRANSACTIONS_PATH = os.environ.get('TRANSACTIONS_PATH')
+
+TRANSACTION_COLUMNS = [
+    'Timestamp', 'Client', 'Bank', 'Country', 'Industry', 'Amount',
+    'Status', 'Failure_Reason', 'Remitter_ID', 'Recipient_ID'
+]
+
+
+def load_transactions(path=TRANSACTIONS_PATH):
+    if not path:
+        return None
+    if path.endswith('.parquet'):
+        transactions = pd.read_parquet(path, columns=TRANSACTION_COLUMNS)
+    else:
+        transactions = pd.read_csv(path, usecols=TRANSACTION_COLUMNS)
+    transactions['Timestamp'] = pd.to_datetime(transactions['Timestamp'])
+    return transactions
@@ -0,0 +1,193 @@
+# Imports
+import calendar
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+WEEKDAYS = list(calendar.day_name)
+
+# Two-sided 95% band
+Z_SCORE = 1.96
+
+
+# Models
+# Both take a 2-D array (one row per series, e.g. per client) and fit every
+# row at once: the loop runs over time steps, each step vectorized across rows.
+def seasonal_naive(series, season, horizon):
+    series = np.atleast_2d(np.asarray(series, dtype=float))
+    steps = np.arange(horizon) % season
+    return series[:, -season:][:, steps]
+
+
+# Additive Holt-Winters. With season=None this is Holt's linear trend method.
+# Returns (forecast[n, horizon], sigma[n, horizon]): the standard deviation of
+# the one-step-ahead in-sample errors, widened for each further step by the
+# additive model's error propagation, sigma_h^2 = sigma^2 (1 + sum c_j^2)
+# with c_j = alpha (1 + j beta) + gamma [j is a whole number of seasons].
+def holt_winters(series, season=None, alpha=0.5, beta=0.1, gamma=0.3, horizon=1):
+    series = np.atleast_2d(np.asarray(series, dtype=float))
+    n_series, n_obs = series.shape
+    if season and n_obs < 2 * season:
+        raise ValueError(f"Holt-Winters needs two full seasons ({2 * season} observations), got {n_obs}")
+
+    if season:
+        level = series[:, :season].mean(axis=1)
+        trend = (series[:, season:2 * season].mean(axis=1) - level) / season
+        seasonal = series[:, :season] - level[:, None]
+        start = season
+    else:
+        level = series[:, 0].copy()
+        trend = np.zeros(n_series)
+        seasonal = np.zeros((n_series, 1))
+        start = 1
+        season = 1
+        gamma = 0.0
+
+    errors = np.zeros((n_series, max(n_obs - start, 1)))
+    for t in range(start, n_obs):
+        current = seasonal[:, t % season]
+        errors[:, t - start] = series[:, t] - (level + trend + current)
+        new_level = alpha * (series[:, t] - current) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        seasonal[:, t % season] = gamma * (series[:, t] - new_level) + (1 - gamma) * current
+        level = new_level
+
+    steps = np.arange(1, horizon + 1)
+    forecast = level[:, None] + steps * trend[:, None] + seasonal[:, (n_obs + steps - 1) % season]
+    ahead = steps[:-1]
+    propagation = alpha * (1 + ahead * beta) + gamma * (ahead % season == 0)
+    widening = np.sqrt(1 + np.r_[0.0, np.cumsum(propagation ** 2)])
+    return forecast, errors.std(axis=1)[:, None] * widening
+
+
+def _days_in_month(month):
+    return ((month + 1) - month.astype('datetime64[D]')).astype(int)
+
+
+# Forecasts
+# Fitted in one batch over every series in `slices` ({name: {'monthly',
+# 'daily', 'hourly'}}): next month's volume with a 95% band, and the
+# half-hour volumes of the coming day for each weekday, from the intraday
+# profile scaled by the weekday's share. The overlay shows tomorrow's weekday
+# by the viewer's clock, so nothing here depends on the refresh date.
+# `observed_through` is the date of the last transaction; a last month it
+# does not cover to the end is left out of the fit, so a partial month does
+# not read as a collapse. The forecast then takes two steps: the first, the
+# month in progress, scales the coming day, the second is next month. With
+# no complete month there is nothing to fit and no forecasts are returned.
+def build_forecasts(slices, observed_through=None):
+    names = list(slices)
+    monthly = np.vstack([slices[name]['monthly']['Volume'].to_numpy(dtype=float) for name in names])
+    periods = slices[names[0]]['monthly']['Period'].to_numpy().astype('datetime64[M]')
+    complete = len(periods)
+    if complete and observed_through is not None and (
+            np.datetime64(observed_through, 'D') < periods[-1] + 1 - np.timedelta64(1, 'D')):
+        complete -= 1
+    if not complete:
+        return {}
+    next_month = periods[-1] + 1
+    coming_month = periods[complete - 1] + 1
+
+    # Holt-Winters needs two years of months; with one year use Holt's trend
+    season = 12 if complete >= 24 else None
+    forecast, sigma = holt_winters(monthly[:, :complete], season=season, horizon=len(periods) + 1 - complete)
+    forecast = np.clip(forecast, 0, None)
+    next_volume = forecast[:, -1]
+    half_width = Z_SCORE * sigma[:, -1]
+
+    # Average day of the month the coming day falls in, weighted by each
+    # weekday's share
+    daily = np.vstack([
+        slices[name]['daily'].set_index('Day')['Volume'].reindex(WEEKDAYS).fillna(0).to_numpy(dtype=float)
+        for name in names
+    ])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weekday_factor = np.nan_to_num(7 * daily / daily.sum(axis=1, keepdims=True), nan=1.0)
+        next_day = forecast[:, :1] / _days_in_month(coming_month) * weekday_factor
+
+        hourly = np.vstack([slices[name]['hourly']['Volume'].to_numpy(dtype=float) for name in names])
+        profile = seasonal_naive(hourly, season=hourly.shape[1], horizon=hourly.shape[1])
+        shares = np.nan_to_num(profile / profile.sum(axis=1, keepdims=True))
+        intraday = (next_day[:, :, None] * shares[:, None, :]).reshape(len(names), -1)
+
+        # Intraday bands carry that month's relative uncertainty
+        relative = np.nan_to_num(Z_SCORE * sigma[:, 0] / forecast[:, 0], nan=0.0, posinf=0.0)
+
+    n_slots = hourly.shape[1]
+    forecasts = {}
+    for i, name in enumerate(names):
+        forecasts[name] = {
+            'monthly': {
+                'Month': f"{pd.Timestamp(next_month):%B %Y} (Forecast)",
+                'Volume': next_volume[i],
+                'Lower': max(next_volume[i] - half_width[i], 0.0),
+                'Upper': next_volume[i] + half_width[i]
+            },
+            'hourly': pd.DataFrame({
+                'Weekday': np.repeat(WEEKDAYS, n_slots),
+                'Hour': np.tile(slices[name]['hourly']['Hour'].to_numpy(), len(WEEKDAYS)),
+                'Volume': intraday[i],
+                'Lower': np.clip(intraday[i] * (1 - relative[i]), 0, None),
+                'Upper': intraday[i] * (1 + relative[i])
+            })
+        }
+    return forecasts
+
+
+# Figure overlays
+# Volume traces keep their raw KES values in `meta` so the clientside unit
+# toggle in assets/dashboard.js can rescale them.
+def add_monthly_forecast(figure, forecast):
+    monthly = forecast['monthly']
+    upper = monthly['Upper'] - monthly['Volume']
+    lower = monthly['Volume'] - monthly['Lower']
+    return figure.add_trace(go.Scatter(
+        name='Forecast (95%)',
+        x=[monthly['Month']],
+        y=[monthly['Volume']/1e6],
+        mode='markers',
+        marker=dict(size=10, symbol='diamond', color='rgba(26, 118, 255, 0.5)'),
+        error_y=dict(type='data', symmetric=False, array=[upper/1e6], arrayminus=[lower/1e6]),
+        meta={'raw': [monthly['Volume']], 'rawUpper': [upper], 'rawLower': [lower]},
+        yaxis='y'
+    ))
+
+
+# One band and line per weekday, all hidden; the clientside callback shows
+# the weekday of tomorrow by the browser's clock
+def add_intraday_forecast(figure, forecast):
+    for day, hourly in forecast['hourly'].groupby('Weekday', sort=False):
+        band = dict(
+            x=hourly['Hour'], mode='lines', line=dict(width=0), hoverinfo='skip',
+            showlegend=False, visible=False, yaxis='y'
+        )
+        figure.add_trace(go.Scatter(
+            y=hourly['Upper']/1e6,
+            meta={'raw': hourly['Upper'].tolist(), 'weekday': day},
+            **band
+        ))
+        figure.add_trace(go.Scatter(
+            y=hourly['Lower']/1e6,
+            fill='tonexty',
+            fillcolor='rgba(26, 118, 255, 0.15)',
+            meta={'raw': hourly['Lower'].tolist(), 'weekday': day},
+            **band
+        ))
+        figure.add_trace(go.Scatter(
+            name=f"{day} Forecast",
+            x=hourly['Hour'],
+            y=hourly['Volume']/1e6,
+            mode='lines',
+            line=dict(width=2, dash='dash', color='rgba(26, 118, 255, 0.8)'),
+            visible=False,
+            meta={'raw': hourly['Volume'].tolist(), 'weekday': day},
+            yaxis='y'
+        ))
+    return figure
+
+
+FORECAST_OVERLAYS = {
+    'monthly': add_monthly_forecast,
+    'hourly': add_intraday_forecast,
+}
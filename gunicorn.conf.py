@@ -0,0 +1,18 @@
+# Gunicorn settings
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8080)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+
+# Import app2 (data, layouts, cached client pages) once in the master and
+# fork workers from it instead of rebuilding everything per worker
+preload_app = True
+
+
+# Move everything built during preload into the permanent GC generation so
+# collections in the workers do not touch (and un-share) those pages
+def pre_fork(server, worker):
+    gc.freeze()
@@ -0,0 +1,152 @@
+# Imports
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import Response, g, request
+
+# Opt-in profiling: fraction of requests to run under cProfile, and where the
+# .prof dumps go (inspect with `python -m pstats` or snakeviz)
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+
+# One sampled profile at a time per process: concurrent cProfile sessions
+# under gthread/gevent raise ValueError on Python 3.12+, so a sample that
+# finds the lock held is skipped
+PROFILE_LOCK = threading.Lock()
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# Histogram
+# Minimal Prometheus-style histogram keyed by a single label. Metrics are per
+# process, so each gunicorn worker exposes its own series.
+class Histogram:
+    def __init__(self, name, help_text, label):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, label_value, seconds):
+        with self.lock:
+            counts, count, total = self.series.get(label_value, ([0] * len(BUCKETS), 0, 0.0))
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    counts[i] += 1
+            self.series[label_value] = (counts, count + 1, total + seconds)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self.lock:
+            for label_value, (counts, count, total) in sorted(self.series.items()):
+                label = f'{self.label}="{_escape(label_value)}"'
+                for bound, bucket_count in zip(BUCKETS, counts):
+                    lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {bucket_count}')
+                lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {count}')
+                lines.append(f'{self.name}_sum{{{label}}} {total}')
+                lines.append(f'{self.name}_count{{{label}}} {count}')
+        return '\n'.join(lines)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REQUEST_SECONDS = Histogram('bizdash_request_seconds', 'HTTP request duration by route.', 'route')
+CALLBACK_SECONDS = Histogram('bizdash_callback_seconds', 'Dash callback execution time.', 'callback')
+SERIALIZATION_SECONDS = Histogram(
+    'bizdash_serialization_seconds', 'Callback output JSON serialization time.', 'callback'
+)
+QUERY_SECONDS = Histogram('bizdash_query_seconds', 'Data query and aggregation time.', 'query')
+
+HISTOGRAMS = (REQUEST_SECONDS, CALLBACK_SECONDS, SERIALIZATION_SECONDS, QUERY_SECONDS)
+
+
+# Data access timing, usable as `with timed_query('name'):` or `@timed_query('name')`
+@contextmanager
+def timed_query(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        QUERY_SECONDS.observe(name, time.perf_counter() - start)
+
+
+# Callback timing: wrap the function underneath @app.callback. Dash serializes
+# the outputs after the callback returns, so the time from here to the end of
+# the request is recorded as serialization.
+def timed_callback(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            finished = time.perf_counter()
+            CALLBACK_SECONDS.observe(func.__name__, finished - start)
+            g.callback_name = func.__name__
+            g.callback_finished = finished
+    return wrapper
+
+
+# Request hooks
+def _before_request():
+    g.request_started = time.perf_counter()
+    if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE and PROFILE_LOCK.acquire(blocking=False):
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiling tool is active in this process
+            PROFILE_LOCK.release()
+            return
+        g.profiler = profiler
+
+
+def _stop_profiler():
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        try:
+            profiler.disable()
+        finally:
+            PROFILE_LOCK.release()
+    return profiler
+
+
+def _after_request(response):
+    finished = time.perf_counter()
+    profiler = _stop_profiler()
+    if profiler is not None:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        route = re.sub(r'[^\w.-]', '_', request.path.strip('/')) or 'index'
+        profiler.dump_stats(os.path.join(PROFILE_DIR, f'{int(time.time() * 1000)}-{route}.prof'))
+    if 'callback_finished' in g:
+        SERIALIZATION_SECONDS.observe(g.callback_name, finished - g.callback_finished)
+    if 'request_started' in g:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_SECONDS.observe(route, finished - g.request_started)
+    return response
+
+
+def _metrics():
+    body = '\n'.join(histogram.render() for histogram in HISTOGRAMS) + '\n'
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+
+# Failed requests skip after_request; release the profiler regardless
+def _teardown_request(exception):
+    _stop_profiler()
+
+
+def instrument(server):
+    server.before_request(_before_request)
+    server.after_request(_after_request)
+    server.teardown_request(_teardown_request)
+    server.add_url_rule('/metrics', 'metrics', _metrics)
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+# Raw transaction frames in the export layout: random rows over Nov 2025 -
+# Oct 2026, with any column overridden by keyword (a scalar or a sequence of
+# `rows` values)
+@pytest.fixture
+def make_transactions():
+    def make(rows=20000, seed=0, **columns):
+        rng = np.random.default_rng(seed)
+        status = np.where(rng.random(rows) < 0.9, 'Success', 'Failed')
+        frame = pd.DataFrame({
+            'Timestamp': pd.Timestamp('2025-11-01') + pd.to_timedelta(rng.integers(0, 340 * 86400, rows), unit='s'),
+            'Client': rng.choice(['Lemfi', 'Nala', 'DLocal'], rows),
+            'Bank': rng.choice(['KCB Bank', 'Equity Bank', 'Mystery Bank'], rows),
+            'Country': rng.choice(['Kenya (KEN)', 'United Kingdom (GBR)'], rows),
+            'Industry': 'Other',
+            'Amount': rng.gamma(2, 5000, rows).round(2),
+            'Status': status,
+            'Failure_Reason': np.where(status == 'Failed', 'Timed Out', None),
+            'Remitter_ID': rng.integers(0, 2000, rows).astype(str),
+            'Recipient_ID': rng.integers(0, 3000, rows)
+        })
+        for name, values in columns.items():
+            frame[name] = values
+        return frame
+    return make
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+import aggregates
+from activity import activity_grids
+from transactions import encode_transactions
+
+
+def _single(make_transactions, timestamps):
+    return make_transactions(rows=len(timestamps), Timestamp=timestamps, Client='Lemfi', Status='Success')
+
+
+@pytest.mark.parametrize('slot_minutes', [7, 0, -30, 60])
+def test_slot_minutes_must_divide_the_day_into_half_hours_or_finer(make_transactions, slot_minutes):
+    table = encode_transactions(_single(make_transactions, pd.to_datetime(['2026-01-05 23:59'])))
+    with pytest.raises(ValueError):
+        activity_grids(table, slot_minutes)
+
+
+def test_timezone_aware_exports_bin_on_local_time(make_transactions):
+    # 23:45 EAT on a Monday is 20:45 UTC
+    timestamps = pd.to_datetime(['2026-01-05 23:45']).tz_localize('Africa/Nairobi')
+    table = encode_transactions(_single(make_transactions, timestamps))
+    grid = activity_grids(table, 30)['Lemfi']['Count']
+    assert grid[0, -1] == 1 and grid.sum() == 1
+
+    _, clients = aggregates.client_slices(table)
+    hourly = clients['Lemfi']['hourly']
+    assert hourly.loc[hourly['Count'] > 0, 'Hour'].tolist() == ['11:30:00 PM']
+    daily = clients['Lemfi']['daily']
+    assert daily.loc[daily['Count'] > 0, 'Day'].tolist() == ['Monday']
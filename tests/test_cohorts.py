@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from activity import NAT
+from cohorts import cohort_matrix, retention_rates
+
+
+def _table(activity):
+    ids, timestamps = zip(*activity)
+    return {
+        'columns': {
+            'Remitter_ID': np.array(ids, dtype=np.int16),
+            'Timestamp': pd.to_datetime(list(timestamps)).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        },
+        'lookups': {},
+        'rows': len(ids)
+    }
+
+
+def test_cohort_matrix_and_retention():
+    table = _table([
+        (0, '2025-01-03'), (0, '2025-02-10'),                      # Jan cohort, back in Feb
+        (1, '2025-01-20'), (1, '2025-03-01'),                      # Jan cohort, back in Mar
+        (2, '2025-02-14'),                                         # Feb cohort, gone
+        (3, '2025-02-01'), (3, '2025-02-27'), (3, '2025-03-31'),   # Feb cohort, back in Mar
+    ])
+    # Rows without an id or a timestamp are ignored
+    table['columns']['Remitter_ID'] = np.append(table['columns']['Remitter_ID'], [-1, 2]).astype(np.int16)
+    table['columns']['Timestamp'] = np.append(table['columns']['Timestamp'], [0, NAT])
+
+    matrix = cohort_matrix(table)
+
+    labels = ['January 2025', 'February 2025', 'March 2025']
+    assert list(matrix.index) == labels and list(matrix.columns) == labels
+    np.testing.assert_array_equal(matrix.to_numpy(), [[2, 1, 1], [0, 2, 1], [0, 0, 0]])
+
+    rates = retention_rates(matrix).to_numpy()
+    np.testing.assert_allclose(rates[:2], [[100, 50, 50], [0, 100, 50]])
+    assert np.isnan(rates[2]).all()
+
+
+def test_cohort_matrix_without_activity_is_empty():
+    table = _table([(0, '2025-01-03')])
+    table['columns']['Timestamp'][:] = NAT
+    assert cohort_matrix(table).empty
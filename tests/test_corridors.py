@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from corridors import corridor_aggregate, sankey_links
+from transactions import encode_transactions
+
+
+def _with_missing_banks(make_transactions):
+    transactions = make_transactions(rows=5000)
+    transactions.loc[transactions.index[::10], 'Bank'] = None
+    transactions.loc[transactions.index[::7], 'Country'] = None
+    return transactions
+
+
+def test_corridors_keep_every_transaction(make_transactions):
+    transactions = _with_missing_banks(make_transactions)
+    corridors = corridor_aggregate(encode_transactions(transactions))
+
+    assert corridors['Count'].sum() == len(transactions)
+    assert corridors['Volume'].sum() == pytest.approx(transactions['Amount'].sum())
+    non_bank = corridors.loc[corridors['Bank'] == 'Non-bank payout', 'Count'].sum()
+    assert non_bank == transactions['Bank'].isna().sum()
+    by_country = corridors.groupby('Country')['Volume'].sum()
+    assert by_country['Unknown'] == pytest.approx(transactions.loc[transactions['Country'].isna(), 'Amount'].sum())
+
+
+@pytest.mark.parametrize('min_share', [0, 0.05, 0.3])
+def test_pruned_links_balance_each_client(make_transactions, min_share):
+    transactions = _with_missing_banks(make_transactions)
+    links = sankey_links(corridor_aggregate(encode_transactions(transactions)), min_share=min_share)
+
+    inflow = links[links['Target'].str.startswith('Client: ')].groupby('Target')['Volume'].sum()
+    outflow = links[links['Source'].str.startswith('Client: ')].groupby('Source')['Volume'].sum()
+    np.testing.assert_allclose(inflow.sort_index().to_numpy(), outflow.sort_index().to_numpy())
+    assert list(inflow.sort_index().index) == list(outflow.sort_index().index)
+    assert inflow.sum() == pytest.approx(transactions['Amount'].sum())
+    if min_share:
+        threshold = transactions['Amount'].sum() * min_share
+        kept = links[~links['Source'].str.endswith(': Other') & ~links['Target'].str.endswith(': Other')]
+        assert (kept['Volume'] >= threshold).all()
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import aggregates
+from forecasting import WEEKDAYS, build_forecasts, holt_winters
+
+
+def test_holt_winters_linear_trend():
+    # With alpha = beta = 1 Holt's method tracks a straight line exactly
+    forecast, sigma = holt_winters(np.arange(10.0) * 3 + 5, alpha=1.0, beta=1.0, horizon=3)
+    np.testing.assert_allclose(forecast, [[35, 38, 41]])
+    assert forecast.shape == sigma.shape == (1, 3)
+
+
+def test_holt_winters_batch_and_band():
+    rng = np.random.default_rng(0)
+    series = 100 + np.sin(np.arange(36) * np.pi / 6) * 10 + rng.normal(0, 2, (3, 36))
+    forecast, sigma = holt_winters(series, season=12, horizon=4)
+    # Each row is fitted on its own
+    for i in range(3):
+        row_forecast, row_sigma = holt_winters(series[i], season=12, horizon=4)
+        np.testing.assert_allclose(forecast[i], row_forecast[0])
+        np.testing.assert_allclose(sigma[i], row_sigma[0])
+    # Errors compound, so the band widens with the horizon
+    assert (np.diff(sigma, axis=1) > 0).all()
+
+    with pytest.raises(ValueError):
+        holt_winters(series[:, :20], season=12)
+
+
+def _slices(volumes, periods):
+    return {'Portfolio': {
+        'monthly': pd.DataFrame({'Volume': volumes, 'Period': pd.to_datetime(periods)}),
+        'daily': pd.DataFrame({'Day': WEEKDAYS, 'Volume': 1.0}),
+        'hourly': pd.DataFrame({'Hour': ['12:00:00 AM', '12:00:00 PM'], 'Volume': [1.0, 3.0]})
+    }}
+
+
+def test_build_forecasts_partial_month():
+    periods = pd.date_range('2025-11-01', '2026-10-01', freq='MS')
+    volumes = np.linspace(310, 400, 12)
+    volumes[-1] = 150          # October, observed through the 15th
+    forecasts = build_forecasts(_slices(volumes, periods), observed_through='2026-10-15')['Portfolio']
+
+    # October is left out of the fit: the month in progress is the first step,
+    # the forecast month the second
+    forecast, sigma = holt_winters(volumes[:11], horizon=2)
+    assert forecasts['monthly']['Month'] == 'November 2026 (Forecast)'
+    assert forecasts['monthly']['Volume'] == pytest.approx(forecast[0, 1])
+    assert forecasts['monthly']['Upper'] - forecasts['monthly']['Volume'] == pytest.approx(1.96 * sigma[0, 1])
+
+    # The coming day is scaled from October's forecast, not November's
+    hourly = forecasts['hourly']
+    assert list(hourly['Weekday'].unique()) == WEEKDAYS
+    np.testing.assert_allclose(hourly['Volume'][:2], forecast[0, 0] / 31 * np.array([0.25, 0.75]))
+
+
+def test_build_forecasts_without_complete_month():
+    slices = _slices([150.0], ['2026-10-01'])
+    assert build_forecasts(slices, observed_through='2026-10-15') == {}
+    assert build_forecasts(_slices([], []), observed_through=None) == {}
+
+
+@pytest.mark.parametrize('timestamps', [
+    pd.Timestamp('2026-10-01') + pd.to_timedelta(np.arange(2000) * 300, unit='s'),
+    pd.NaT
+])
+def test_refresh_without_complete_month(make_transactions, timestamps):
+    dashboard = aggregates.refresh(make_transactions(2000, Timestamp=timestamps))
+    assert dashboard['forecasts'] == {}
+    assert len(dashboard['portfolio']['monthly']) <= 1
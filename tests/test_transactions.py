@@ -0,0 +1,16 @@
+import numpy as np
+
+from transactions import AMOUNT_SCALE, encode_transactions
+
+
+def test_non_finite_amounts_encode_as_zero(make_transactions, caplog):
+    transactions = make_transactions(rows=100)
+    transactions.loc[[3, 7], 'Amount'] = np.nan
+    transactions.loc[11, 'Amount'] = np.inf
+
+    amounts = encode_transactions(transactions)['columns']['Amount']
+
+    assert (amounts[[3, 7, 11]] == 0).all()
+    finite = transactions['Amount'].drop([3, 7, 11])
+    assert amounts.sum() == np.rint(finite * AMOUNT_SCALE).sum()
+    assert '3 transaction(s)' in caplog.text
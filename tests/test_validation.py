@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import aggregates
+from activity import activity_grids
+from corridors import corridor_aggregate, sankey_links
+from transactions import encode_transactions
+from validation import ReconciliationError, enforce, reconcile_aggregates, reconcile_client_slices
+
+
+def _with_missing_dimensions(transactions, seed=1):
+    rng = np.random.default_rng(seed)
+    transactions = transactions.copy()
+    transactions.loc[rng.random(len(transactions)) < 0.1, 'Bank'] = None
+    transactions.loc[rng.random(len(transactions)) < 0.05, 'Country'] = None
+    transactions.loc[rng.choice(len(transactions), 5, replace=False), 'Timestamp'] = pd.NaT
+    return transactions
+
+
+def test_refresh_accepts_missing_dimensions(make_transactions):
+    transactions = _with_missing_dimensions(make_transactions())
+    dashboard = aggregates.refresh(transactions)
+
+    assert dashboard['source'] == 'transactions'
+    lemfi = dashboard['clients']['Lemfi']
+    raw = transactions[transactions['Client'] == 'Lemfi']
+    assert lemfi['country']['Volume'].sum() == pytest.approx(raw['Amount'].sum())
+    assert 'Unknown' in set(lemfi['country']['Country'])
+    timed = raw[raw['Timestamp'].notna()]
+    for name in ('monthly', 'daily', 'hourly'):
+        assert lemfi[name]['Count'].sum() == len(timed)
+        assert lemfi[name]['Volume'].sum() == pytest.approx(timed['Amount'].sum())
+    assert lemfi['bank']['Count'].sum() == raw['Bank'].notna().sum()
+
+
+def test_slices_are_reconciled_against_raw_totals(make_transactions):
+    table = encode_transactions(make_transactions())
+    _, clients = aggregates.client_slices(table)
+    assert reconcile_client_slices(clients, table).empty
+
+    # A slice that drops rows still agrees with itself, but not with the table
+    clients['Nala']['daily'] = clients['Nala']['daily'].iloc[1:]
+    report = reconcile_client_slices(clients, table)
+    assert set(report['Table']) == {'clients.daily'}
+    assert set(report['Key']) == {'Nala'}
+    with pytest.raises(ReconciliationError):
+        enforce(report, strict=True)
+
+
+def test_aggregates_are_reconciled_against_each_other(make_transactions):
+    table = encode_transactions(_with_missing_dimensions(make_transactions(), seed=2))
+    # Some rows without a client, which only the portfolio and 'Unknown' carry
+    table['columns']['Client'][:50] = -1
+    portfolio, clients = aggregates.client_slices(table)
+    corridors = sankey_links(corridor_aggregate(table))
+    activity = activity_grids(table)
+    assert reconcile_aggregates(portfolio, clients, corridors, activity, table).empty
+
+    # Each aggregate drifting on its own is caught against the others
+    portfolio['country'] = portfolio['country'].iloc[1:]
+    corridors = corridors[corridors['Target'] != 'Bank: KCB Bank']
+    activity['Nala'] = dict(activity['Nala'], Count=activity['Nala']['Count'] * 2)
+    report = reconcile_aggregates(portfolio, clients, corridors, activity, table)
+    assert set(report['Table']) == {'portfolio.country', 'corridors.outflow', 'activity'}
+    assert set(report.loc[report['Table'] == 'activity', 'Key']) == {'Nala'}
+    assert set(report.loc[report['Table'] == 'corridors.outflow', 'Key']) == {'Lemfi', 'Nala', 'DLocal'}
@@ -0,0 +1,246 @@
+# Imports
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from data import (
+    monthly_data, daily_data, hourly_data, country_data, client_data,
+    industry_data, failure_data, recipients_data
+)
+from activity import NAT
+from corridors import MISSING
+from transactions import AMOUNT_SCALE
+
+logger = logging.getLogger(__name__)
+
+# 'strict' fails the refresh on any mismatch, 'warn' logs the diff report and
+# publishes anyway. Unset, transaction-level refreshes are strict and the
+# hand-typed summary tables only warn.
+RECONCILIATION = os.environ.get('RECONCILIATION')
+
+# Typed totals may differ by this fraction of the reference total; stored
+# shares by this many percentage points (they are typed to one or two
+# decimals). Slices aggregated from the transactions must match their raw
+# totals up to floating-point summation error.
+TOTAL_TOLERANCE = 0.001
+SHARE_TOLERANCE = 0.1
+SLICE_TOLERANCE = 1e-9
+
+# Every breakdown must add up to the monthly totals. recipients_data covers
+# bank-account payouts only, so it is checked for shares but not totals.
+VOLUME_TOTALS = {
+    'monthly_data': (monthly_data, 'Volume'),
+    'daily_data': (daily_data, 'Volume'),
+    'hourly_data': (hourly_data, 'Volume'),
+    'country_data': (country_data, 'Volume_KES'),
+    'client_data': (client_data, 'Volume'),
+    'industry_data': (industry_data, 'Volume'),
+}
+
+COUNT_TOTALS = {
+    'monthly_data': (monthly_data, 'Count'),
+    'daily_data': (daily_data, 'Count'),
+    'hourly_data': (hourly_data, 'Count'),
+    'country_data': (country_data, 'Transactions'),
+    'client_data': (client_data, 'Transactions'),
+}
+
+# Stored percentage columns and the column they must be derived from
+SHARES = {
+    'failure_data': (failure_data, 'Reason', 'Count', 'Percentage'),
+    'client_data': (client_data, 'Client', 'Volume', 'Market_Share'),
+    'recipients_data': (recipients_data, 'Bank', 'Volume', 'Market_Share'),
+}
+
+REPORT_COLUMNS = ['Check', 'Table', 'Key', 'Expected', 'Actual', 'Difference']
+
+
+class ReconciliationError(Exception):
+    def __init__(self, report):
+        self.report = report
+        super().__init__(
+            f"{len(report)} reconciliation check(s) failed; refusing to publish:\n"
+            f"{report.to_string(index=False)}"
+        )
+
+
+# Totals: one vector of table totals compared against the reference in a
+# single array operation
+def _total_mismatches(check, totals, reference):
+    names = list(totals)
+    actual = np.array([totals[name] for name in names], dtype=float)
+    expected = float(totals[reference])
+    difference = actual - expected
+    failed = np.abs(difference) > TOTAL_TOLERANCE * abs(expected)
+    return pd.DataFrame({
+        'Check': check,
+        'Table': np.array(names)[failed],
+        'Key': 'Total',
+        'Expected': expected,
+        'Actual': actual[failed],
+        'Difference': difference[failed]
+    }, columns=REPORT_COLUMNS)
+
+
+def _share_mismatches(table, frame, key, base, stored):
+    values = frame[base].to_numpy(dtype=float)
+    derived = values / values.sum() * 100
+    difference = frame[stored].to_numpy(dtype=float) - derived
+    failed = np.abs(difference) > SHARE_TOLERANCE
+    return pd.DataFrame({
+        'Check': f'{stored} from {base}',
+        'Table': table,
+        'Key': frame[key].to_numpy()[failed],
+        'Expected': derived[failed],
+        'Actual': frame[stored].to_numpy(dtype=float)[failed],
+        'Difference': difference[failed]
+    }, columns=REPORT_COLUMNS)
+
+
+def reconcile_summary_tables():
+    reports = [
+        _total_mismatches('Volume total', {
+            name: frame[column].sum() for name, (frame, column) in VOLUME_TOTALS.items()
+        }, 'monthly_data'),
+        _total_mismatches('Count total', {
+            name: frame[column].sum() for name, (frame, column) in COUNT_TOTALS.items()
+        }, 'monthly_data'),
+        *[_share_mismatches(table, *spec) for table, spec in SHARES.items()]
+    ]
+    return pd.concat(reports, ignore_index=True)
+
+
+# Per-client slices are checked against each client's totals taken straight
+# from the compact table. Time slices cover the rows with a timestamp, the
+# country slice every row; bank slices cover bank payouts only and, as with
+# recipients_data, are not held to the totals.
+SLICE_ROWS = {
+    'monthly': 'timed',
+    'daily': 'timed',
+    'hourly': 'timed',
+    'country': 'all',
+}
+
+
+# Totals per client code, with the rows without a client in a trailing bucket
+def _raw_totals(table):
+    columns = table['columns']
+    n_clients = len(table['lookups']['Client'])
+    clients = columns['Client'].astype(np.int64)
+    clients = np.where(clients < 0, n_clients, clients)
+    timed = columns['Timestamp'] != NAT
+    return {
+        rows_name: {
+            'Volume': np.bincount(
+                clients[rows], weights=columns['Amount'][rows], minlength=n_clients + 1
+            ) / AMOUNT_SCALE,
+            'Count': np.bincount(clients[rows], minlength=n_clients + 1).astype(float)
+        }
+        for rows_name, rows in (('all', slice(None)), ('timed', timed))
+    }
+
+
+def _raw_client_totals(table):
+    raw = _raw_totals(table)
+    untimed = int(raw['all']['Count'][:-1].sum() - raw['timed']['Count'][:-1].sum())
+    if untimed:
+        logger.warning("%d transaction(s) without a timestamp are left out of the time slices", untimed)
+    return raw
+
+
+# A clients x slices matrix of slice totals compared against the matching
+# matrix of raw totals at once
+def reconcile_client_slices(slices, table):
+    raw = _raw_client_totals(table)
+    codes = {client: code for code, client in enumerate(table['lookups']['Client'])}
+    clients = list(slices)
+    index = [codes[client] for client in clients]
+    names = list(SLICE_ROWS)
+    reports = []
+    for measure in ('Volume', 'Count'):
+        shape = (len(clients), len(names))
+        totals = np.array([
+            [slices[client][name][measure].sum() for name in names] for client in clients
+        ], dtype=float).reshape(shape)
+        expected = np.array([
+            raw[SLICE_ROWS[name]][measure][index] for name in names
+        ], dtype=float).T.reshape(shape)
+        difference = totals - expected
+        failed = np.abs(difference) > SLICE_TOLERANCE * np.abs(expected)
+        rows, cols = np.nonzero(failed)
+        reports.append(pd.DataFrame({
+            'Check': f'{measure} total',
+            'Table': [f'clients.{names[col]}' for col in cols],
+            'Key': np.array(clients, dtype=object)[rows],
+            'Expected': expected[rows, cols],
+            'Actual': totals[rows, cols],
+            'Difference': difference[rows, cols]
+        }, columns=REPORT_COLUMNS))
+    return pd.concat(reports, ignore_index=True)
+
+
+# Aggregates built from the same table must also agree with each other. The
+# portfolio slices are the client slices plus the rows without a client; at
+# every client node of the Sankey, inflow from countries and outflow to banks
+# carry the client's full total; the activity grids carry its timed total.
+def reconcile_aggregates(portfolio, slices, corridors, activity, table):
+    raw = _raw_totals(table)
+    clients = list(table['lookups']['Client'])
+    nodes = [f'Client: {client}' for client in clients + [MISSING['Client']]]
+    inflow = corridors[corridors['Source'].str.startswith('Country: ')].groupby('Target')
+    outflow = corridors[corridors['Source'].str.startswith('Client: ')].groupby('Source')
+    reports = []
+    for measure in ('Volume', 'Count'):
+        tables, keys, expected, actual = [], [], [], []
+
+        def check(table_name, key, expected_total, actual_total):
+            tables.append(table_name)
+            keys.append(key)
+            expected.append(expected_total)
+            actual.append(actual_total)
+
+        for name, rows in SLICE_ROWS.items():
+            check(
+                f'portfolio.{name}', 'Portfolio',
+                sum(client[name][measure].sum() for client in slices.values()) + raw[rows][measure][-1],
+                portfolio[name][measure].sum()
+            )
+        for name, flow in (('corridors.inflow', inflow), ('corridors.outflow', outflow)):
+            totals = flow[measure].sum().reindex(nodes, fill_value=0)
+            for node, raw_total, total in zip(nodes, raw['all'][measure], totals):
+                check(name, node.split(': ', 1)[1], raw_total, total)
+        check('activity', 'Portfolio', raw['timed'][measure].sum(), activity['Portfolio'][measure].sum())
+        for client, raw_total in zip(clients, raw['timed'][measure]):
+            check('activity', client, raw_total, activity[client][measure].sum() if client in activity else 0.0)
+
+        expected, actual = np.array(expected, dtype=float), np.array(actual, dtype=float)
+        difference = actual - expected
+        failed = np.abs(difference) > SLICE_TOLERANCE * np.abs(expected)
+        reports.append(pd.DataFrame({
+            'Check': f'{measure} total',
+            'Table': np.array(tables, dtype=object)[failed],
+            'Key': np.array(keys, dtype=object)[failed],
+            'Expected': expected[failed],
+            'Actual': actual[failed],
+            'Difference': difference[failed]
+        }, columns=REPORT_COLUMNS))
+    return pd.concat(reports, ignore_index=True)
+
+
+def enforce(report, strict):
+    if report.empty:
+        return report
+    if strict:
+        raise ReconciliationError(report)
+    logger.warning(
+        "%d reconciliation check(s) failed:\n%s", len(report), report.to_string(index=False)
+    )
+    return report
+
+
+def is_strict(default):
+    if RECONCILIATION is None:
+        return default
+    return RECONCILIATION == 'strict'